@@ -0,0 +1,210 @@
+"""Compiled kernels for averaging static word vectors.
+
+This module provides the word-vector averaging used by the FastText and
+Word2Vec embedding models. When Numba is installed, float32 matrices are
+averaged by a compiled loop that reads each row once, skipping rows that
+contain NaN, and accumulates in place instead of materializing the
+gathered rows; otherwise, and for int8-quantized matrices, a NumPy
+gather is used.
+"""
+
+import numpy as np
+
+from ..core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Number of word indices above which the multi-threaded kernel is used
+PARALLEL_THRESHOLD = 10_000
+
+# Try to import Numba without failing if unavailable
+try:
+    from numba import get_num_threads, njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    logger.debug("Numba not available, word vectors will be averaged with NumPy")
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    # fastmath without the no-NaN/no-inf assumptions, so NaN checks are kept
+    _FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+    @njit(cache=True, fastmath=_FASTMATH)
+    def _row_is_valid(matrix: np.ndarray, k: int) -> bool:
+        for d in range(matrix.shape[1]):
+            if matrix[k, d] != matrix[k, d]:
+                return False
+        return True
+
+    @njit(cache=True, fastmath=_FASTMATH)
+    def _sum_rows(matrix: np.ndarray, idxs: np.ndarray) -> tuple[np.ndarray, int]:
+        dim = matrix.shape[1]
+        acc = np.zeros(dim, dtype=np.float32)
+        count = 0
+        for i in range(idxs.shape[0]):
+            k = idxs[i]
+            if k >= 0 and _row_is_valid(matrix, k):
+                for d in range(dim):
+                    acc[d] += matrix[k, d]
+                count += 1
+        return acc, count
+
+    @njit(cache=True, fastmath=_FASTMATH, parallel=True)
+    def _sum_rows_parallel(matrix: np.ndarray, idxs: np.ndarray, n_chunks: int) -> tuple[np.ndarray, int]:
+        dim = matrix.shape[1]
+        n = idxs.shape[0]
+        partial = np.zeros((n_chunks, dim), dtype=np.float32)
+        counts = np.zeros(n_chunks, dtype=np.int64)
+        chunk_size = (n + n_chunks - 1) // n_chunks
+        for c in prange(n_chunks):
+            for i in range(c * chunk_size, min((c + 1) * chunk_size, n)):
+                k = idxs[i]
+                if k >= 0 and _row_is_valid(matrix, k):
+                    for d in range(dim):
+                        partial[c, d] += matrix[k, d]
+                    counts[c] += 1
+        return partial.sum(axis=0), counts.sum()
+
+    @njit(cache=True, fastmath=_FASTMATH)
+    def _sum_rows_batch(matrix: np.ndarray, idxs: np.ndarray, offsets: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        dim = matrix.shape[1]
+        n_texts = offsets.shape[0] - 1
+        sums = np.zeros((n_texts, dim), dtype=np.float32)
+        counts = np.zeros(n_texts, dtype=np.int64)
+        for t in range(n_texts):
+            for i in range(offsets[t], offsets[t + 1]):
+                k = idxs[i]
+                if k >= 0 and _row_is_valid(matrix, k):
+                    for d in range(dim):
+                        sums[t, d] += matrix[k, d]
+                    counts[t] += 1
+        return sums, counts
+
+
+def _drop_nan_rows(matrix: np.ndarray, idxs: np.ndarray, scales: np.ndarray | None) -> np.ndarray:
+    """Mark the indices of rows containing NaN as unknown words.
+
+    Args:
+        matrix: Word vectors, one row per word.
+        idxs: int64 row indices.
+        scales: Per-row dequantization scales if ``matrix`` is int8-quantized.
+
+    Returns:
+        np.ndarray: Copy of ``idxs`` with -1 for rows containing NaN.
+
+    """
+    idxs = idxs.copy()
+    valid = np.flatnonzero(idxs >= 0)
+    rows = idxs[valid]
+    if scales is not None:
+        bad = np.isnan(scales[rows])
+    else:
+        bad = np.isnan(matrix[rows]).any(axis=1)
+    idxs[valid[bad]] = -1
+    return idxs
+
+
+def _mean_rows(matrix: np.ndarray, idxs: np.ndarray, scales: np.ndarray | None) -> np.ndarray | None:
+    """Average the rows of known words with NumPy, or return None if there are none."""
+    idxs = idxs[idxs >= 0]
+    if not idxs.size:
+        return None
+    mean: np.ndarray
+    if scales is not None:
+        # Scale each quantized row while summing, as one matrix-vector product
+        mean = (scales[idxs] @ matrix[idxs].astype(np.float32)) / idxs.size
+    else:
+        mean = matrix[idxs].mean(axis=0, dtype=np.float32)
+    return mean
+
+
+def _sum_rows_segments(matrix: np.ndarray, idxs: np.ndarray, lengths: np.ndarray, scales: np.ndarray | None) -> tuple[np.ndarray, np.ndarray]:
+    """Sum the rows of known words of each text with one NumPy gather and reduceat."""
+    n_texts = lengths.shape[0]
+
+    # Segment id of every index, then drop unknown words
+    segments = np.repeat(np.arange(n_texts), lengths)
+    valid = idxs >= 0
+    segments = segments[valid]
+    counts = np.bincount(segments, minlength=n_texts)
+
+    sums = np.zeros((n_texts, matrix.shape[1]), dtype=np.float32)
+    if segments.size:
+        rows = matrix[idxs[valid]]
+        if scales is not None:
+            rows = rows.astype(np.float32)
+            rows *= scales[idxs[valid], None]
+        nonempty = counts > 0
+        starts = np.zeros(n_texts, dtype=np.int64)
+        np.cumsum(counts[:-1], out=starts[1:])
+        sums[nonempty] = np.add.reduceat(rows, starts[nonempty], axis=0, dtype=np.float32)
+
+    return sums, counts
+
+
+def mean_embedding(matrix: np.ndarray, idxs: np.ndarray, scales: np.ndarray | None = None) -> np.ndarray | None:
+    """Average the rows of a word vector matrix.
+
+    Rows containing NaN are skipped like unknown words. The compiled kernel
+    does this while accumulating; the NumPy path only rescans the rows when
+    the mean comes out NaN.
+
+    Args:
+        matrix: Word vectors, one row per word.
+        idxs: int64 row indices; negative entries (unknown words) are skipped.
+        scales: Per-row dequantization scales if ``matrix`` is int8-quantized.
+
+    Returns:
+        Optional[np.ndarray]: float32 mean of the selected rows, or None if no index is valid.
+
+    """
+    if NUMBA_AVAILABLE and scales is None and matrix.dtype == np.float32:
+        matrix = np.asarray(matrix)
+        acc: np.ndarray
+        if idxs.shape[0] > PARALLEL_THRESHOLD:
+            acc, count = _sum_rows_parallel(matrix, idxs, get_num_threads())
+        else:
+            acc, count = _sum_rows(matrix, idxs)
+
+        if count == 0:
+            return None
+        acc /= count
+        return acc
+
+    mean = _mean_rows(matrix, idxs, scales)
+    if mean is not None and np.isnan(mean).any():
+        mean = _mean_rows(matrix, _drop_nan_rows(matrix, idxs, scales), scales)
+    return mean
+
+
+def mean_embeddings(matrix: np.ndarray, idxs: np.ndarray, lengths: np.ndarray, scales: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """Average the rows of a word vector matrix for several texts at once.
+
+    The word indices of all texts are passed as one concatenated array, so
+    the whole batch is served by a single gather and reduction. Rows
+    containing NaN are skipped, as in mean_embedding.
+
+    Args:
+        matrix: Word vectors, one row per word.
+        idxs: Concatenated int64 row indices of all texts; negative entries are skipped.
+        lengths: Number of indices belonging to each text.
+        scales: Per-row dequantization scales if ``matrix`` is int8-quantized.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: float32 means of shape (len(lengths), dim), with zero
+            rows for texts without any valid index, and the number of valid indices per text.
+
+    """
+    if NUMBA_AVAILABLE and scales is None and matrix.dtype == np.float32:
+        offsets = np.zeros(lengths.shape[0] + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        sums, counts = _sum_rows_batch(np.asarray(matrix), idxs, offsets)
+    else:
+        sums, counts = _sum_rows_segments(matrix, idxs, lengths, scales)
+        if np.isnan(sums).any():
+            sums, counts = _sum_rows_segments(matrix, _drop_nan_rows(matrix, idxs, scales), lengths, scales)
+
+    sums /= np.maximum(counts, 1)[:, None]
+    return sums, counts
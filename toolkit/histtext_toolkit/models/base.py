@@ -4,13 +4,163 @@ This module defines abstract base classes that all model implementations
 must inherit from, ensuring a consistent interface across different backends.
 """
 
+import os
+import queue
+import sys
+import threading
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Optional
 
 import numpy as np
 
+from ..core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Set once configure_cuda_allocator has run
+_CUDA_ALLOCATOR_CONFIGURED = False
+
+
+def configure_cuda_allocator() -> None:
+    """Let the CUDA caching allocator grow its segments instead of fragmenting.
+
+    Sets ``PYTORCH_CUDA_ALLOC_CONF=expandable_segments:True`` unless the
+    allocator is already configured. Variable input lengths otherwise leave
+    reserved memory split into blocks too small to reuse, which surfaces as
+    out-of-memory errors. The setting only takes effect if applied before
+    CUDA is initialized, so models call this at the start of ``load()``.
+
+    Expandable segments cannot be shared through CUDA IPC; deployments that
+    pass CUDA tensors between processes should set PYTORCH_CUDA_ALLOC_CONF
+    themselves.
+    """
+    global _CUDA_ALLOCATOR_CONFIGURED
+    if _CUDA_ALLOCATOR_CONFIGURED:
+        return
+    _CUDA_ALLOCATOR_CONFIGURED = True
+
+    if "PYTORCH_CUDA_ALLOC_CONF" in os.environ:
+        return
+
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_initialized():
+        logger.warning("CUDA is already initialized, expandable_segments allocator setting not applied")
+        return
+
+    os.environ["PYTORCH_CUDA_ALLOC_CONF"] = "expandable_segments:True"
+
+
+def quantize_embeddings(vectors: np.ndarray, dtype: str = "int8") -> tuple[np.ndarray, np.ndarray | None]:
+    """Reduce the precision of a matrix of embeddings for storage or transport.
+
+    'int8' quantizes each row symmetrically with its own float32 scale, so
+    ``vectors[i] ~= quantized[i] * scales[i]``. The scale cancels out of
+    cosine similarity, which can be computed on the int8 rows directly
+    with an error well below what matters for retrieval.
+
+    Args:
+        vectors: float32 embeddings, one row per text.
+        dtype: 'float16' or 'int8'.
+
+    Returns:
+        Tuple[np.ndarray, Optional[np.ndarray]]: The reduced embeddings, and the per-row
+            scales for 'int8' (None for 'float16').
+
+    Raises:
+        ValueError: If ``dtype`` is not supported.
+
+    """
+    if dtype == "float16":
+        return vectors.astype(np.float16), None
+    if dtype != "int8":
+        raise ValueError(f"Unsupported embedding dtype: {dtype}")
+
+    scales = np.abs(vectors).max(axis=1) / np.float32(127.0)
+    safe_scales = np.where(scales > 0, scales, np.float32(1.0))
+    quantized = np.rint(vectors / safe_scales[:, None]).astype(np.int8)
+    return quantized, scales.astype(np.float32, copy=False)
+
+
+class RequestBatcher:
+    """Merges concurrent single-item calls into batched calls.
+
+    A background thread takes every item queued since its last call and
+    passes them together to the batch function, so tokenization and the
+    forward pass run once per group of callers. Nothing waits for a batch
+    to fill: a lone caller is served immediately, and callers arriving
+    during a call are batched into the next one.
+    """
+
+    def __init__(self, process: Callable[[list[Any]], Sequence[Any]], max_batch: int = 32, name: str = "request-batcher"):
+        """Start the batching thread.
+
+        Args:
+            process: Function mapping a list of items to one result per item.
+            max_batch: Maximum number of items passed in one call.
+            name: Name of the batching thread.
+
+        """
+        self._process = process
+        self._max_batch = max_batch
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        """Queue an item for processing.
+
+        Args:
+            item: Item to process.
+
+        Returns:
+            Future: Resolves to the item's result, or to the batch function's error.
+
+        """
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def close(self) -> None:
+        """Stop the batching thread once queued items are processed."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            stop = False
+            while len(batch) < self._max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            try:
+                results = self._process([value for value, _ in batch])
+                if len(results) != len(batch):
+                    raise ValueError(f"Batch function returned {len(results)} results for {len(batch)} items")
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results, strict=True):
+                    future.set_result(result)
+
+            if stop:
+                return
+
 
 class ModelType(Enum):
     """Enumeration of supported model types.
@@ -44,7 +194,7 @@ class AggregationStrategy(Enum):
     AVERAGE = "average"  # Use average value
 
 
-@dataclass
+@dataclass(slots=True)
 class Entity:
     """Representation of a named entity.
 
@@ -67,7 +217,7 @@ class Entity:
     confidence: float = -1.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Token:
     """Representation of a token.
 
@@ -173,6 +323,21 @@ class NERModel(BaseModel):
         """
         pass
 
+    def extract_entities_batch(self, texts: list[str]) -> list[list[Entity]]:
+        """Extract named entities from several texts.
+
+        The default implementation processes the texts one by one; models
+        that can run several texts through one forward pass override it.
+
+        Args:
+            texts: Input texts to analyze
+
+        Returns:
+            List[List[Entity]]: Extracted entities of each text, empty for blank texts
+
+        """
+        return [self.extract_entities(text) if text and not text.isspace() else [] for text in texts]
+
     def short_format(self, entities: list[Entity]) -> list[dict[str, Any]]:
         """Convert entities to a shortened format.
 
@@ -262,6 +427,69 @@ class EmbeddingsModel(BaseModel):
         """
         pass
 
+    def embed_batch_ndarray(self, texts: list[str], out: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Generate embeddings for a batch of texts as a single matrix.
+
+        Vectors are written into one preallocated float32 array, ready to be
+        passed to vector indexes without stacking a list of arrays first.
+        Callers embedding many batches can pass the same ``out`` buffer every
+        time to avoid reallocating it.
+
+        Args:
+            texts: List of texts to embed
+            out: Optional float32 buffer with at least len(texts) rows of the
+                model dimension; its first len(texts) rows are overwritten
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Embeddings of shape (len(texts), dim), with zero
+                rows for failures, and a boolean mask that is True where embedding succeeded
+
+        Raises:
+            ValueError: If ``out`` is too small for the batch
+
+        """
+        vectors = self.embed_batch(texts)
+        dim = self.get_dimension()
+        if out is None:
+            out = np.zeros((len(texts), dim), dtype=np.float32)
+        else:
+            if out.ndim != 2 or out.shape[0] < len(texts) or out.shape[1] != dim:
+                raise ValueError(f"Output buffer of shape {out.shape} cannot hold {len(texts)} embeddings of dimension {dim}")
+            out = out[: len(texts)]
+        ok = np.zeros(len(texts), dtype=bool)
+
+        for i, vector in enumerate(vectors):
+            if vector is not None:
+                out[i] = vector
+                ok[i] = True
+            else:
+                out[i] = 0.0
+
+        return out, ok
+
+    def embed_batch_quantized(self, texts: list[str], dtype: str = "int8") -> tuple[np.ndarray, np.ndarray | None, np.ndarray]:
+        """Generate reduced-precision embeddings for a batch of texts.
+
+        int8 embeddings take a quarter of the memory of float32 ones, and
+        float16 half; see quantize_embeddings.
+
+        Args:
+            texts: List of texts to embed
+            dtype: 'float16' or 'int8'
+
+        Returns:
+            Tuple[np.ndarray, Optional[np.ndarray], np.ndarray]: Embeddings of shape (len(texts), dim),
+                per-row scales for 'int8' (None for 'float16'), and a boolean mask that is True
+                where embedding succeeded
+
+        Raises:
+            ValueError: If ``dtype`` is not supported
+
+        """
+        vectors, ok = self.embed_batch_ndarray(texts)
+        quantized, scales = quantize_embeddings(vectors, dtype)
+        return quantized, scales, ok
+
     @abstractmethod
     def get_dimension(self) -> int:
         """Get the dimensionality of the embedding vectors.
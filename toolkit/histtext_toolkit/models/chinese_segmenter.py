@@ -5,6 +5,8 @@ that automatically adapts to available hardware resources for optimal performanc
 """
 
 import concurrent.futures
+import contextlib
+import gc
 import logging
 import os
 import signal
@@ -35,6 +37,14 @@ except ImportError:
     logger.warning("ChineseWordSegmenter not available. Install with `pip install git+https://github.com/hhhuang/ChineseWordSegmenter.git`")
     CWSEG_AVAILABLE = False
 
+# Try to import PyTorch without failing if unavailable
+try:
+    import torch
+
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
 
 class ChineseSegmenterModel(TokenizationModel):
     """ChineseWordSegmenter implementation of tokenization model with hardware adaptation.
@@ -189,8 +199,6 @@ class ChineseSegmenterModel(TokenizationModel):
 
                     if model_memory > 0:
                         # Get total available memory
-                        import torch
-
                         total_memory = torch.cuda.get_device_properties(0).total_memory
 
                         # Calculate optimal configuration
@@ -206,8 +214,6 @@ class ChineseSegmenterModel(TokenizationModel):
                     else:
                         logger.warning("Memory measurement returned zero, falling back to estimates")
                         # Fallback to estimates based on total memory
-                        import torch
-
                         total_memory = torch.cuda.get_device_properties(0).total_memory
 
                         # Estimate as percentage of total memory based on GPU size
@@ -364,9 +370,7 @@ class ChineseSegmenterModel(TokenizationModel):
             # Configure GPU memory if available
             if hardware["gpu_available"]:
                 try:
-                    import torch
-
-                    if torch.cuda.is_available():
+                    if TORCH_AVAILABLE and torch.cuda.is_available():
                         # Set memory fraction for PyTorch
                         torch.cuda.empty_cache()
                         torch.cuda.set_per_process_memory_fraction(self.target_memory_usage, 0)
@@ -403,9 +407,7 @@ class ChineseSegmenterModel(TokenizationModel):
             int: Measured memory in bytes
 
         """
-        import torch
-
-        if not torch.cuda.is_available():
+        if not TORCH_AVAILABLE or not torch.cuda.is_available():
             logger.warning("CUDA not available, cannot measure GPU memory")
             return 0
 
@@ -489,8 +491,6 @@ class ChineseSegmenterModel(TokenizationModel):
                     gc_measurements.append(memory_diff)
 
                 # Force garbage collection
-                import gc
-
                 gc.collect()
                 torch.cuda.empty_cache()
 
@@ -687,8 +687,6 @@ class ChineseSegmenterModel(TokenizationModel):
                 self._token_cache.clear()
 
             # Force garbage collection
-            import gc
-
             gc.collect()
 
             # Force CUDA memory cleanup if available
@@ -828,11 +826,14 @@ class ChineseSegmenterModel(TokenizationModel):
             # Get the appropriate model for this task
             model = self._get_model_for_task(task_id)
 
-            # Get segmented tokens
-            tokens_text = model.tokenize(text)
+            # Get segmented tokens, without autograd bookkeeping in the model's forward pass
+            with torch.inference_mode() if TORCH_AVAILABLE else contextlib.nullcontext():
+                tokens_text = model.tokenize(text)
 
-            # Convert to Token objects with positions
-            result_tokens = []
+            # Convert to Token objects with positions, with the per-token calls bound once
+            result_tokens: list[Token] = []
+            append = result_tokens.append
+            find = text.find
             current_pos = 0
 
             for token_text in tokens_text:
@@ -841,12 +842,13 @@ class ChineseSegmenterModel(TokenizationModel):
                     continue
 
                 # Find token in the original text
-                start_pos = text.find(token_text, current_pos)
+                token_len = len(token_text)
+                start_pos = find(token_text, current_pos)
 
                 if start_pos >= 0:
                     # Found the token in the text
-                    end_pos = start_pos + len(token_text)
-                    result_tokens.append(
+                    end_pos = start_pos + token_len
+                    append(
                         Token(
                             text=token_text,
                             start_pos=start_pos,
@@ -885,19 +887,18 @@ class ChineseSegmenterModel(TokenizationModel):
         start_time = time.time()
 
         # Check cache first for each text
-        results = []
+        results: list[list[Token]] = [[] for _ in texts]
         texts_to_process = []
         indices_to_process = []
 
         for i, text in enumerate(texts):
             if not text or len(text) < 2:
-                results.append([])
                 continue
 
-            if text in self._token_cache:
-                results.append(self._token_cache[text])
+            cached = self._token_cache.get(text)
+            if cached is not None:
+                results[i] = cached
             else:
-                results.append([])  # Placeholder
                 texts_to_process.append(text)
                 indices_to_process.append(i)
 
@@ -911,14 +912,14 @@ class ChineseSegmenterModel(TokenizationModel):
             with concurrent.futures.ThreadPoolExecutor(max_workers=self.parallel_workers) as executor:
                 futures = {}
                 for i, (idx, text) in enumerate(zip(indices_to_process, texts_to_process)):
-                    futures[executor.submit(self._process_text_to_tokens, text, i)] = idx
+                    futures[executor.submit(self._process_text_to_tokens, text, i)] = (idx, text)
 
                 # Collect results as they complete
                 for future in concurrent.futures.as_completed(futures):
                     try:
-                        idx = futures[future]
+                        idx, text = futures[future]
                         tokens = future.result()
-                        self._token_cache[texts_to_process[indices_to_process.index(idx)]] = tokens
+                        self._token_cache[text] = tokens
                         results[idx] = tokens
                     except Exception as e:
                         logger.error(f"Error in tokenization: {e}")
@@ -947,9 +948,7 @@ class ChineseSegmenterModel(TokenizationModel):
 
             # Log GPU memory usage if available
             try:
-                import torch
-
-                if torch.cuda.is_available():
+                if TORCH_AVAILABLE and torch.cuda.is_available():
                     device = torch.cuda.current_device()
                     allocated = torch.cuda.memory_allocated(device) / 1024**3
                     reserved = torch.cuda.memory_reserved(device) / 1024**3
@@ -4,8 +4,16 @@ This module provides an implementation of EmbeddingsModel using the FastText lib
 with robust error handling.
 """
 
+import contextlib
+import functools
+import gc
+import hashlib
 import os
-from typing import Optional
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Optional
 
 import numpy as np
 
@@ -18,7 +26,8 @@ from ..core.errors import (
     safe_embed,
 )
 from ..core.logging import get_logger
-from .base import EmbeddingsModel
+from ._vec_kernels import mean_embedding, mean_embeddings
+from .base import EmbeddingsModel, RequestBatcher, configure_cuda_allocator
 
 logger = get_logger(__name__)
 
@@ -31,6 +40,420 @@ except ImportError:
     logger.warning("FastText not available. Install with `pip install fasttext`")
     FASTTEXT_AVAILABLE = False
 
+# Try to import PyTorch without failing if unavailable
+try:
+    import torch
+
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+# Maximum number of text embeddings kept by the batch embedding cache
+EMBEDDING_CACHE_SIZE = 100_000
+
+# Number of leading .vec rows (the most frequent words) kept as a float32 block
+HOT_VOCAB_SIZE = 10_000
+
+# Maximum number of words of a preprocessed text that are embedded
+MAX_TEXT_WORDS = 20_000
+
+# Directory for .vec caches when the .vec file's own directory is read-only and no
+# cache directory is configured; processes mapping the cache share its page cache
+VEC_FALLBACK_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "histtext_toolkit", "vec")
+
+# Minimum number of .vec bytes per worker process when parsing in parallel
+VEC_PARALLEL_MIN_BYTES = 1 << 28  # 256 MB
+
+# Storage dtypes for .vec word vectors; vectors are upcast to float32 on lookup.
+# 'i8' rows are quantized symmetrically with one float32 scale per row.
+VEC_DTYPES = {"f16": np.float16, "f32": np.float32, "i8": np.int8}
+
+try:
+    import ml_dtypes
+
+    VEC_DTYPES["bf16"] = ml_dtypes.bfloat16
+except ImportError:
+    pass
+
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+
+@contextlib.contextmanager
+def _file_lock(lock_path: str) -> Iterator[None]:
+    """Hold an exclusive advisory lock on a file, where supported.
+
+    The lock file is removed when the lock is released.
+
+    Args:
+        lock_path: Path of the lock file, created if missing.
+
+    """
+    if not FCNTL_AVAILABLE:
+        yield
+        return
+
+    try:
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    except OSError:
+        yield
+        return
+
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Unlink while still holding the lock; waiters re-check the cache once they get it
+        with contextlib.suppress(OSError):
+            os.unlink(lock_path)
+        os.close(fd)
+
+
+def _parse_vec_range(
+    vec_path: str, start: int, end: int, dim: int, vec_dtype: str, size_hint: int
+) -> tuple[list[str], np.ndarray, np.ndarray | None, list[str]]:
+    """Parse the .vec lines starting within a byte range of the file.
+
+    A line belongs to the range its first byte falls in, so adjacent ranges
+    can be parsed independently, including in separate processes.
+
+    Args:
+        vec_path: Path to the .vec file.
+        start: First byte of the range.
+        end: Byte after the end of the range.
+        dim: Vector dimension from the file header.
+        vec_dtype: Key of VEC_DTYPES used to store the vectors.
+        size_hint: Expected number of vectors, used to preallocate the matrix.
+
+    Returns:
+        Tuple[List[str], np.ndarray, Optional[np.ndarray], List[str]]: Words, their vectors,
+            the per-row scales of int8 vectors (None otherwise) and a description of each skipped line.
+
+    """
+    words: list[str] = []
+    errors: list[str] = []
+    matrix = np.empty((max(size_hint, 1), dim), dtype=VEC_DTYPES[vec_dtype])
+    scales = np.empty(matrix.shape[0], dtype=np.float32) if vec_dtype == "i8" else None
+
+    with open(vec_path, "rb") as f:
+        # The range is read once front to back
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), start, end - start, os.POSIX_FADV_SEQUENTIAL)
+
+        # Skip the line that started in the previous range
+        f.seek(max(start - 1, 0))
+        if start > 0 and f.read(1) != b"\n":
+            f.readline()
+
+        offset = f.tell()
+        while offset < end:
+            line = f.readline()
+            if not line:
+                break
+            line_start, offset = offset, offset + len(line)
+
+            raw_word, _, values = line.rstrip().partition(b" ")
+            try:
+                word = raw_word.decode("utf-8")
+                vector = np.fromstring(values, sep=" ", dtype=np.float32)
+            except ValueError:
+                errors.append(f"invalid vector values at byte {line_start}")
+                continue
+
+            if not word or vector.size < dim:
+                errors.append(f"expected {dim} values at byte {line_start}, got {vector.size}")
+                continue
+
+            if len(words) == matrix.shape[0]:
+                matrix = np.concatenate([matrix, np.empty_like(matrix)])
+                if scales is not None:
+                    scales = np.concatenate([scales, np.empty_like(scales)])
+
+            vector = vector[:dim]
+            if scales is not None:
+                scale = np.abs(vector).max() / 127.0
+                scales[len(words)] = scale
+                vector = np.rint(vector / scale) if scale > 0 else np.zeros_like(vector)
+            matrix[len(words)] = vector
+            words.append(word)
+
+    if len(words) < matrix.shape[0]:
+        matrix = matrix[: len(words)].copy()
+        if scales is not None:
+            scales = scales[: len(words)].copy()
+
+    return words, matrix, scales, errors
+
+
+class VecModel:
+    """Word vectors loaded from a FastText .vec file.
+
+    Vectors are stored as the rows of a single contiguous matrix, with a
+    dictionary mapping each word to its row. The matrix may be kept in a
+    reduced precision dtype, or as int8 with one scale per row; lookups
+    always return float32.
+
+    .vec files list words by decreasing frequency, so the first rows are
+    also kept as a read-only float32 block that single-word lookups can
+    return without converting.
+
+    Attributes:
+        matrix (np.ndarray): Word vectors, one row per word.
+        scales (Optional[np.ndarray]): Per-row float32 scales of an int8 ``matrix``.
+        hot_matrix (np.ndarray): float32 copy of the first HOT_VOCAB_SIZE rows.
+        word_to_idx (Dict[str, int]): Mapping from word to its row in ``matrix``.
+        dim (int): Dimension of the word vectors.
+
+    """
+
+    def __init__(self, words: list[str], matrix: np.ndarray, scales: np.ndarray | None = None):
+        """Initialize the word vector model.
+
+        Args:
+            words: Vocabulary, in the same order as the rows of ``matrix``.
+            matrix: Word vectors of shape (len(words), dim).
+            scales: Per-row scales if ``matrix`` is int8-quantized.
+
+        """
+        self.matrix = matrix
+        self.scales = scales
+        self.dim: int = matrix.shape[1]
+        self.word_to_idx = {word: i for i, word in enumerate(words)}
+
+        self.hot_matrix = np.ascontiguousarray(matrix[:HOT_VOCAB_SIZE], dtype=np.float32)
+        if scales is not None:
+            self.hot_matrix *= scales[: self.hot_matrix.shape[0], None]
+        self.hot_matrix.setflags(write=False)
+        self._hot_size = self.hot_matrix.shape[0]
+
+        # Shared zero vector returned for out-of-vocabulary words
+        self._zero = _zero_vector(self.dim)
+
+    def get_word_vector(self, word: str) -> np.ndarray:
+        """Get the vector for a word.
+
+        Args:
+            word: Word to look up.
+
+        Returns:
+            np.ndarray: Word vector, or a read-only zero vector if the word is unknown.
+                Vectors of frequent words are read-only views.
+
+        """
+        idx = self.word_to_idx.get(word)
+        if idx is None:
+            return self._zero
+        vector: np.ndarray
+        if idx < self._hot_size:
+            vector = self.hot_matrix[idx]
+        else:
+            vector = self.matrix[idx].astype(np.float32)
+            if self.scales is not None:
+                vector *= self.scales[idx]
+        return vector
+
+    def get_indices(self, words: list[str]) -> np.ndarray:
+        """Get the matrix row of each word.
+
+        Args:
+            words: Words to look up.
+
+        Returns:
+            np.ndarray: int64 array of row indices, with -1 for unknown words.
+
+        """
+        get = self.word_to_idx.get
+        return np.fromiter((get(word, -1) for word in words), dtype=np.int64, count=len(words))
+
+    def get_word_vectors(self, words: list[str]) -> np.ndarray:
+        """Get the vectors for a sequence of words in one call.
+
+        Args:
+            words: Words to look up.
+
+        Returns:
+            np.ndarray: float32 array of shape (len(words), dim), with zero rows for unknown words.
+
+        """
+        idxs = self.get_indices(words)
+        vectors: np.ndarray = self.matrix[idxs].astype(np.float32)
+        if self.scales is not None:
+            vectors *= self.scales[idxs, None]
+        vectors[idxs < 0] = 0.0
+        return vectors
+
+    def get_dimension(self) -> int:
+        """Get the dimensionality of the word vectors.
+
+        Returns:
+            int: Dimension of word vectors.
+
+        """
+        return self.dim
+
+
+def _prefetch_model_file(path: str) -> None:
+    """Advise the kernel that a model file is about to be read front to back.
+
+    fasttext reads .bin models with buffered I/O; sequential and will-need
+    hints let the kernel read ahead aggressively instead of page by page.
+    Also logs whether transparent huge pages are available, since the
+    model's large allocations load noticeably slower without them.
+
+    Args:
+        path: Path to the model file.
+
+    """
+    if hasattr(os, "posix_fadvise"):
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.debug(f"Could not advise kernel about {path}: {e}")
+
+    try:
+        with open("/sys/kernel/mm/transparent_hugepage/enabled") as f:
+            thp_mode = f.read().strip()
+        logger.debug(f"Transparent huge pages: {thp_mode}")
+        if "[never]" in thp_mode:
+            logger.info("Transparent huge pages are disabled; loading large FastText models may be slower")
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=8)
+def _zero_vector(dim: int) -> np.ndarray:
+    """Return the shared zero embedding of a given dimension.
+
+    The array is read-only so it can be handed out for every empty or
+    out-of-vocabulary text; callers must copy it before modifying it.
+
+    Args:
+        dim: Embedding dimension.
+
+    Returns:
+        np.ndarray: Read-only float32 zero vector.
+
+    """
+    zero = np.zeros(dim, dtype=np.float32)
+    zero.setflags(write=False)
+    return zero
+
+
+def _replace_non_finite(vectors: np.ndarray) -> np.ndarray:
+    """Replace NaN and infinite values of embedding vectors with zeros, in place.
+
+    A single sum detects non-finite values without building a mask, so clean
+    vectors cost one reduction and are never copied.
+
+    Args:
+        vectors: Embedding vector or matrix of embedding vectors.
+
+    Returns:
+        np.ndarray: The same array, cleaned.
+
+    """
+    if not np.isfinite(vectors.sum()):
+        logger.debug("Non-finite values detected in embedding vector. Replacing with zeros.")
+        np.nan_to_num(vectors, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+    return vectors
+
+
+def _normalize_text(text: str) -> str:
+    """Lowercase a text and collapse its whitespace to single spaces.
+
+    Equivalent to ``" ".join(text.lower().split())``, but texts that are
+    already single-spaced skip the split and join.
+
+    Args:
+        text: Input text.
+
+    Returns:
+        str: Normalized text.
+
+    """
+    text = text.lower()
+    # Every whitespace character except the ASCII space is non-printable, so a
+    # printable text without leading, trailing or doubled spaces is already normalized
+    if text.isprintable() and "  " not in text and text[:1] != " " and text[-1:] != " ":
+        return text
+    return " ".join(text.split())
+
+
+def _text_to_words(text: str, tokenization_model: Any, preprocess_text: Callable[[str], str]) -> list[str]:
+    """Split a text into the words whose vectors are averaged.
+
+    Token texts from a tokenizer's ``tokenize`` method are used as they are,
+    instead of being joined by preprocess_text and split again.
+
+    Args:
+        text: Input text.
+        tokenization_model: The embeddings model's optional tokenization model.
+        preprocess_text: The embeddings model's preprocess_text method.
+
+    Returns:
+        List[str]: Words of the text.
+
+    """
+    if not text:
+        return []
+
+    if tokenization_model and not hasattr(tokenization_model, "tokenize_text") and hasattr(tokenization_model, "tokenize"):
+        try:
+            return [token.text for token in tokenization_model.tokenize(text)]
+        except Exception as e:
+            logger.warning(f"Error during tokenization preprocessing: {e}")
+            return _normalize_text(text).split()
+
+    return preprocess_text(text).split()
+
+
+def _embed_batch_gather(
+    texts: list[str],
+    to_words: Callable[[str], list[str]],
+    matrix: np.ndarray,
+    get_indices: Callable[[list[str]], np.ndarray],
+    scales: np.ndarray | None = None,
+) -> list[np.ndarray] | None:
+    """Embed several texts by averaging word vectors with a single gather.
+
+    All texts are tokenized first and their word indices concatenated, so the
+    rows of the whole batch are averaged in one pass instead of text by text.
+
+    Args:
+        texts: Texts to embed.
+        to_words: Splits a text into the words to average.
+        matrix: Word vectors, one row per word.
+        get_indices: Maps a list of words to int64 row indices, -1 for unknown words.
+        scales: Per-row scales if ``matrix`` is int8-quantized.
+
+    Returns:
+        Optional[List[np.ndarray]]: One embedding per text (zeros for texts without known
+            words), or None if the batch failed and texts should be embedded one by one.
+
+    """
+    try:
+        tokenized = [to_words(text)[:MAX_TEXT_WORDS] for text in texts]
+        lengths = np.fromiter((len(words) for words in tokenized), dtype=np.int64, count=len(tokenized))
+        idxs = get_indices([word for words in tokenized for word in words])
+
+        vectors, counts = mean_embeddings(matrix, idxs, lengths, scales)
+        _replace_non_finite(vectors)
+
+        zero = _zero_vector(vectors.shape[1])
+        return [vector if count else zero for vector, count in zip(vectors, counts, strict=True)]
+    except Exception as e:
+        logger.warning(f"Batched embedding failed, embedding texts one by one: {e}")
+        return None
+
 
 class FastTextEmbeddingsModel(EmbeddingsModel):
     """FastText implementation of text embedding model.
@@ -43,6 +466,9 @@ class FastTextEmbeddingsModel(EmbeddingsModel):
         use_precomputed (bool): Whether to use a precomputed model.
         dim (int): Dimension of embeddings.
         tokenization_model: Optional tokenization model for preprocessing.
+        vec_dtype (str): Storage dtype for .vec word vectors ('f16', 'bf16', 'f32' or 'i8').
+        vec_cache (bool): Whether parsed .vec files are cached on disk and memory-mapped.
+        vec_cache_dir (Optional[str]): Directory of the .vec caches, None for next to the .vec file.
 
     """
 
@@ -52,6 +478,9 @@ class FastTextEmbeddingsModel(EmbeddingsModel):
         use_precomputed: bool = True,
         dim: int = 300,
         tokenization_model=None,
+        vec_dtype: str = "f16",
+        vec_cache: bool = False,
+        vec_cache_dir: str | None = None,
     ):
         """Initialize the FastText model.
 
@@ -60,17 +489,36 @@ class FastTextEmbeddingsModel(EmbeddingsModel):
             use_precomputed: Whether to use a precomputed model or train from scratch.
             dim: Dimension of embeddings (used when training from scratch).
             tokenization_model: Optional tokenization model to preprocess texts.
+            vec_dtype: Storage dtype for vectors loaded from .vec files. 'bf16'
+                requires the `ml_dtypes` package; 'i8' stores int8 rows with a
+                float32 scale each, a quarter of the f32 size.
+            vec_cache: Write a binary cache of parsed .vec files (as large as the
+                stored vectors) and memory-map it on later loads. Off by default, so
+                the .vec file is parsed on every load and nothing is written.
+            vec_cache_dir: Directory for the .vec caches. Defaults to the .vec
+                file's directory, or to VEC_FALLBACK_CACHE_DIR if that is read-only.
+
+        Raises:
+            ImportError: If FastText is not installed.
+            ValueError: If vec_dtype is not one of 'f16', 'bf16', 'f32' or 'i8'.
 
         """
         if not FASTTEXT_AVAILABLE:
             raise ImportError("FastText is not installed. Please install it with `pip install fasttext`")
 
+        if vec_dtype not in ("f16", "bf16", "f32", "i8"):
+            raise ValueError(f"Unsupported vec_dtype: {vec_dtype}")
+
         self.model_path = model_path
         self.use_precomputed = use_precomputed
         self.dim = dim
         self.tokenization_model = tokenization_model
-        self._model = None
+        self.vec_dtype = vec_dtype
+        self.vec_cache = vec_cache
+        self.vec_cache_dir = vec_cache_dir
+        self._model: Any = None
         self.is_loaded_flag = False
+        self._embed_cache: OrderedDict[str, np.ndarray] = OrderedDict()
 
         # Determine if this is a pretrained model from Facebook
         self.is_facebook_model = model_path.startswith("cc.") or model_path.startswith("wiki.")
@@ -123,6 +571,10 @@ class FastTextEmbeddingsModel(EmbeddingsModel):
                         except ImportError:
                             pass
 
+                    # Binary models are read in full by fasttext, start readahead now
+                    if not self.model_path.endswith(".vec"):
+                        _prefetch_model_file(self.model_path)
+
                     # Determine if this is a binary or text model
                     if self.model_path.endswith(".bin"):
                         try:
@@ -197,7 +649,14 @@ class FastTextEmbeddingsModel(EmbeddingsModel):
 
     @handle_embedding_errors()
     def _load_vec_file(self, vec_path: str) -> bool:
-        """Load a .vec file into a simple dictionary-based model.
+        """Load a .vec file into a matrix-backed word vector model.
+
+        If vec_cache is enabled, the parsed matrix and vocabulary are written
+        to the cache directory (see _vec_cache_paths) on first load, and
+        memory-mapped from there, so every process loading the same file
+        shares one copy of the matrix. Concurrent first loads wait for a
+        single process to parse the file. If the cache cannot be written, the
+        parsed vectors are used directly.
 
         Args:
             vec_path: Path to the .vec file.
@@ -210,78 +669,30 @@ class FastTextEmbeddingsModel(EmbeddingsModel):
 
         """
         try:
-            word_vectors = {}
-
-            with open(vec_path, encoding="utf-8") as f:
-                # Read header
-                header = f.readline().strip().split()
-                if len(header) != 2:
-                    raise ModelError(
-                        f"Invalid .vec file header: {' '.join(header)}",
-                        model_name=vec_path,
-                        model_type="fasttext",
-                    )
-
-                try:
-                    _, dim = int(header[0]), int(header[1])
-                except ValueError as e:
-                    raise ModelError(
-                        f"Invalid .vec file header format: {' '.join(header)}",
-                        model_name=vec_path,
-                        model_type="fasttext",
-                    ) from e
-
-                self.dim = dim
-
-                # Read vectors
-                line_count = 0
-                error_count = 0
-                max_errors = 10  # Maximum number of errors to report
-
-                for i, line in enumerate(f):
-                    line_count += 1
-                    tokens = line.strip().split()
-
-                    if len(tokens) < dim + 1:
-                        error_count += 1
-                        if error_count <= max_errors:
-                            logger.warning(f"Skipping invalid line {i+1} in {vec_path}: " f"expected {dim+1} tokens, got {len(tokens)}")
-                        continue
-
-                    word = tokens[0]
-                    try:
-                        vector = np.array([float(val) for val in tokens[1 : dim + 1]])
-                        word_vectors[word] = vector
-                    except ValueError:
-                        error_count += 1
-                        if error_count <= max_errors:
-                            logger.warning(f"Skipping line {i+1} in {vec_path} due to " f"invalid vector values")
-                        continue
-
-            if error_count > max_errors:
-                logger.warning(f"{error_count - max_errors} more errors were suppressed")
-
-            if not word_vectors:
-                raise ModelError(
-                    f"No valid word vectors found in {vec_path}",
-                    model_name=vec_path,
-                    model_type="fasttext",
-                )
-
-            # Create a simple model-like class with get_word_vector method
-            class VecModel:
-                def __init__(self, word_vectors, dim):
-                    self.word_vectors = word_vectors
-                    self.dim = dim
-
-                def get_word_vector(self, word):
-                    return self.word_vectors.get(word, np.zeros(self.dim))
+            cached = self._load_vec_cache(vec_path) if self.vec_cache else self._parse_vec_file(vec_path)
+            if cached is not None:
+                if self.vec_cache:
+                    logger.info(f"Memory-mapped {len(cached[0])} cached word vectors from {self._vec_cache_paths(vec_path)[0]}")
+            else:
+                matrix_path = self._vec_cache_paths(vec_path)[0]
+                with contextlib.suppress(OSError):
+                    os.makedirs(os.path.dirname(matrix_path), exist_ok=True)
+                lock = contextlib.nullcontext() if self.vec_dtype == "bf16" else _file_lock(f"{matrix_path}.lock")
+                with lock:
+                    cached = self._load_vec_cache(vec_path)
+                    if cached is None:
+                        parsed = self._parse_vec_file(vec_path)
+                        if self._save_vec_cache(vec_path, *parsed):
+                            # Map the new cache so this process shares its pages with later ones
+                            cached = self._load_vec_cache(vec_path) or parsed
+                        else:
+                            cached = parsed
 
-                def get_dimension(self):
-                    return self.dim
+            words, matrix, scales = cached
 
-            self._model = VecModel(word_vectors, dim)
-            logger.info(f"Loaded {len(word_vectors)} word vectors with dimension {dim} from {vec_path}")
+            self.dim = matrix.shape[1]
+            self._model = VecModel(words, matrix, scales)
+            logger.info(f"Loaded {len(words)} word vectors with dimension {self.dim} from {vec_path}")
             return True
 
         except ModelError:
@@ -296,6 +707,190 @@ class FastTextEmbeddingsModel(EmbeddingsModel):
                 details={"error_type": type(e).__name__},
             ) from e
 
+    def _parse_vec_file(self, vec_path: str) -> tuple[list[str], np.ndarray, np.ndarray | None]:
+        """Parse a .vec text file into a vocabulary and a vector matrix.
+
+        Large files are split into newline-aligned byte ranges that are parsed
+        in parallel by worker processes.
+
+        Args:
+            vec_path: Path to the .vec file.
+
+        Returns:
+            Tuple[List[str], np.ndarray, Optional[np.ndarray]]: Words, their vectors (one row
+                per word) and the per-row scales of int8 vectors.
+
+        Raises:
+            ModelError: If the .vec file is invalid or contains no vectors.
+
+        """
+        with open(vec_path, "rb") as f:
+            # Read header
+            header = f.readline().decode("utf-8", errors="replace").strip().split()
+            data_start = f.tell()
+
+        if len(header) != 2:
+            raise ModelError(
+                f"Invalid .vec file header: {' '.join(header)}",
+                model_name=vec_path,
+                model_type="fasttext",
+            )
+
+        try:
+            num_words, dim = int(header[0]), int(header[1])
+        except ValueError as e:
+            raise ModelError(
+                f"Invalid .vec file header format: {' '.join(header)}",
+                model_name=vec_path,
+                model_type="fasttext",
+            ) from e
+
+        vec_dtype = self.vec_dtype
+        if vec_dtype not in VEC_DTYPES:
+            logger.warning(f"vec_dtype '{vec_dtype}' requires ml_dtypes, storing vectors as f16")
+            vec_dtype = "f16"
+
+        file_size = os.path.getsize(vec_path)
+        n_workers = min(os.cpu_count() or 1, max(1, (file_size - data_start) // VEC_PARALLEL_MIN_BYTES))
+        bounds = np.linspace(data_start, file_size, n_workers + 1, dtype=np.int64).tolist()
+        ranges = [(vec_path, bounds[i], bounds[i + 1], dim, vec_dtype, num_words // n_workers) for i in range(n_workers)]
+
+        parts = None
+        if n_workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                    parts = list(executor.map(_parse_vec_range, *zip(*ranges, strict=True)))
+                logger.debug(f"Parsed {vec_path} with {n_workers} worker processes")
+            except (OSError, BrokenProcessPool) as e:
+                logger.warning(f"Parallel parsing of {vec_path} failed, parsing in a single process: {e}")
+
+        if parts is None:
+            parts = [_parse_vec_range(vec_path, data_start, file_size, dim, vec_dtype, num_words)]
+
+        words = [word for part_words, _, _, _ in parts for word in part_words]
+        errors = [error for _, _, _, part_errors in parts for error in part_errors]
+
+        max_errors = 10  # Maximum number of errors to report
+        for error in errors[:max_errors]:
+            logger.warning(f"Skipping invalid line in {vec_path}: {error}")
+        if len(errors) > max_errors:
+            logger.warning(f"{len(errors) - max_errors} more errors were suppressed")
+
+        if not words:
+            raise ModelError(
+                f"No valid word vectors found in {vec_path}",
+                model_name=vec_path,
+                model_type="fasttext",
+            )
+
+        if len(parts) == 1:
+            return words, parts[0][1], parts[0][2]
+
+        matrix = np.concatenate([part_matrix for _, part_matrix, _, _ in parts])
+        scales = None if parts[0][2] is None else np.concatenate([part_scales for _, _, part_scales, _ in parts])
+        return words, matrix, scales
+
+    def _vec_cache_paths(self, vec_path: str) -> tuple[str, str, str]:
+        """Get the paths of the binary cache files for a .vec file.
+
+        Caches live in vec_cache_dir when it is set, otherwise next to the
+        .vec file, or in VEC_FALLBACK_CACHE_DIR when the .vec file's directory
+        is not writable. Outside the .vec file's directory, names are
+        prefixed with a hash of its path.
+
+        Args:
+            vec_path: Path to the .vec file.
+
+        Returns:
+            Tuple[str, str, str]: Paths of the matrix (.npy), vocabulary and int8 scales (.npy) files.
+
+        """
+        prefix = vec_path
+        cache_dir = self.vec_cache_dir
+        if cache_dir is None and not os.access(os.path.dirname(os.path.abspath(vec_path)), os.W_OK):
+            cache_dir = VEC_FALLBACK_CACHE_DIR
+        if cache_dir is not None:
+            key = hashlib.blake2b(os.path.abspath(vec_path).encode("utf-8"), digest_size=8).hexdigest()
+            prefix = os.path.join(cache_dir, f"histtext_{key}_{os.path.basename(vec_path)}")
+
+        return f"{prefix}.{self.vec_dtype}.npy", f"{prefix}.words", f"{prefix}.{self.vec_dtype}.scales.npy"
+
+    def _load_vec_cache(self, vec_path: str) -> tuple[list[str], np.ndarray, np.ndarray | None] | None:
+        """Memory-map the binary cache of a .vec file if it is up to date.
+
+        Args:
+            vec_path: Path to the .vec file.
+
+        Returns:
+            Optional[Tuple[List[str], np.ndarray, Optional[np.ndarray]]]: Words, read-only matrix and
+                int8 scales, or None if there is no usable cache.
+
+        """
+        matrix_path, words_path, scales_path = self._vec_cache_paths(vec_path)
+        cache_paths = [matrix_path, words_path] + ([scales_path] if self.vec_dtype == "i8" else [])
+        try:
+            vec_mtime = os.path.getmtime(vec_path)
+            if any(os.path.getmtime(path) < vec_mtime for path in cache_paths):
+                return None
+
+            matrix = np.load(matrix_path, mmap_mode="r")
+            scales = np.load(scales_path) if self.vec_dtype == "i8" else None
+            with open(words_path, encoding="utf-8") as f:
+                words = f.read().split("\n")
+
+            if len(words) != matrix.shape[0] or (scales is not None and len(scales) != matrix.shape[0]):
+                logger.warning(f"Ignoring inconsistent .vec cache for {vec_path}")
+                return None
+
+            return words, matrix, scales
+        except (OSError, ValueError):
+            return None
+
+    def _save_vec_cache(self, vec_path: str, words: list[str], matrix: np.ndarray, scales: np.ndarray | None = None) -> bool:
+        """Write the binary cache of a parsed .vec file.
+
+        Only numpy-native dtypes are cached; failures are logged and their
+        temporary files removed.
+
+        Args:
+            vec_path: Path to the .vec file.
+            words: Parsed vocabulary.
+            matrix: Parsed vectors.
+            scales: Per-row scales of int8 vectors.
+
+        Returns:
+            bool: True if the cache was written, False otherwise.
+
+        """
+        if self.vec_dtype == "bf16":
+            return False
+
+        matrix_path, words_path, scales_path = self._vec_cache_paths(vec_path)
+        # Write to temporary files first so readers never see a partial cache
+        tmp_matrix_path = f"{matrix_path}.{os.getpid()}.tmp"
+        tmp_words_path = f"{words_path}.{os.getpid()}.tmp"
+        tmp_scales_path = f"{scales_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_matrix_path, "wb") as f:
+                np.save(f, matrix)
+            with open(tmp_words_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(words))
+            if scales is not None:
+                with open(tmp_scales_path, "wb") as f:
+                    np.save(f, scales)
+                os.replace(tmp_scales_path, scales_path)
+
+            os.replace(tmp_words_path, words_path)
+            os.replace(tmp_matrix_path, matrix_path)
+            logger.info(f"Cached parsed word vectors to {matrix_path}")
+            return True
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not write .vec cache for {vec_path}, loading without it: {e}")
+            for tmp_path in (tmp_matrix_path, tmp_words_path, tmp_scales_path):
+                with contextlib.suppress(OSError):
+                    os.remove(tmp_path)
+            return False
+
     @handle_embedding_errors()
     def unload(self) -> bool:
         """Unload the FastText model from memory.
@@ -308,10 +903,9 @@ class FastTextEmbeddingsModel(EmbeddingsModel):
             del self._model
             self._model = None
             self.is_loaded_flag = False
+            self._embed_cache.clear()
 
             # Force garbage collection
-            import gc
-
             gc.collect()
 
             logger.info("Unloaded FastText model")
@@ -355,7 +949,7 @@ class FastTextEmbeddingsModel(EmbeddingsModel):
                 logger.warning(f"Error during tokenization preprocessing: {e}")
 
         # Default preprocessing: lowercase and normalize whitespace
-        return " ".join(text.lower().split())
+        return _normalize_text(text)
 
     @safe_embed(logger)
     def embed_text(self, text: str) -> Optional[np.ndarray]:
@@ -378,36 +972,35 @@ class FastTextEmbeddingsModel(EmbeddingsModel):
 
         if not text:
             # Return zero vector for empty text
-            return np.zeros(self.dim)
+            return _zero_vector(self.dim)
 
         try:
-            # Preprocess text
-            processed_text = self.preprocess_text(text)
+            # Preprocess text; sentence vector models need it as a string
+            if hasattr(self._model, "get_sentence_vector"):
+                processed_text = self.preprocess_text(text)
+                words = processed_text.split()
+            else:
+                processed_text = None
+                words = _text_to_words(text, self.tokenization_model, self.preprocess_text)
+            if not words:
+                return _zero_vector(self.dim)
 
             # Limit text length to prevent memory issues
-            max_text_length = 100000  # Set a reasonable limit
-            if len(processed_text) > max_text_length:
-                logger.warning(f"Text length ({len(processed_text)}) exceeds maximum " f"({max_text_length}). Truncating.")
-                processed_text = processed_text[:max_text_length]
+            if len(words) > MAX_TEXT_WORDS:
+                logger.warning(f"Text length ({len(words)} words) exceeds maximum ({MAX_TEXT_WORDS}). Truncating.")
+                words = words[:MAX_TEXT_WORDS]
+                processed_text = " ".join(words)
 
             # Get embedding from model
-            if hasattr(self._model, "get_sentence_vector"):
+            if processed_text is not None:
                 vector = self._model.get_sentence_vector(processed_text)
             else:
-                # Fallback to averaging word vectors
-                words = processed_text.split()
-                if not words:
-                    return np.zeros(self.dim)
-
-                vectors = [self._model.get_word_vector(word) for word in words]
-                vector = np.mean(vectors, axis=0)
-
-            # Check for NaN values in the vector
-            if np.isnan(vector).any():
-                logger.warning("NaN values detected in embedding vector. Replacing with zeros.")
-                vector = np.nan_to_num(vector)
+                # Fallback to averaging the rows of known words
+                vector = mean_embedding(self._model.matrix, self._model.get_indices(words), self._model.scales)
+                if vector is None:
+                    return _zero_vector(self.dim)
 
-            return vector
+            return _replace_non_finite(vector)
         except Exception as e:
             raise EmbeddingError(
                 f"Error embedding text: {e}",
@@ -432,18 +1025,54 @@ class FastTextEmbeddingsModel(EmbeddingsModel):
                 logger.error("Failed to load model for batch embedding")
                 return [None] * len(texts)
 
-        results = []
+        results: list[np.ndarray | None] = [None] * len(texts)
         error_count = 0
         max_reported_errors = 5  # Maximum number of errors to log individually
 
+        # Serve repeated texts from the cache and embed each unique text once
+        pending: dict[str, list[int]] = {}
         for i, text in enumerate(texts):
-            try:
-                results.append(self.embed_text(text))
-            except EmbeddingError as e:
-                error_count += 1
-                if error_count <= max_reported_errors:
-                    logger.error(f"Error embedding text {i}: {e.message}")
-                results.append(None)
+            cached = self._embed_cache.get(text)
+            if cached is not None:
+                self._embed_cache.move_to_end(text)
+                results[i] = cached
+            else:
+                pending.setdefault(text, []).append(i)
+
+        # Word vector models embed all unique texts with a single gather
+        batch_vectors = None
+        if not hasattr(self._model, "get_sentence_vector"):
+            batch_vectors = _embed_batch_gather(
+                list(pending),
+                lambda text: _text_to_words(text, self.tokenization_model, self.preprocess_text),
+                self._model.matrix,
+                self._model.get_indices,
+                self._model.scales,
+            )
+
+        for n, (text, positions) in enumerate(pending.items()):
+            if batch_vectors is not None:
+                vector = batch_vectors[n]
+            else:
+                try:
+                    vector = self.embed_text(text)
+                except EmbeddingError as e:
+                    error_count += 1
+                    if error_count <= max_reported_errors:
+                        logger.error(f"Error embedding text {positions[0]}: {e.message}")
+                    continue
+
+            if vector is not None:
+                # Rows of the gathered batch are views; cache a read-only copy so
+                # neither the batch nor a caller can change what later hits return
+                vector = vector.copy()
+                vector.setflags(write=False)
+                self._embed_cache[text] = vector
+                if len(self._embed_cache) > EMBEDDING_CACHE_SIZE:
+                    self._embed_cache.popitem(last=False)
+
+            for i in positions:
+                results[i] = vector
 
         if error_count > max_reported_errors:
             logger.error(f"{error_count - max_reported_errors} more embedding errors suppressed")
@@ -500,8 +1129,9 @@ class Word2VecEmbeddingsModel(EmbeddingsModel):
         self.binary = binary
         self.dim = dim
         self.tokenization_model = tokenization_model
-        self._model = None
+        self._model: Any = None
         self.is_loaded_flag = False
+        self._embed_cache: OrderedDict[str, np.ndarray] = OrderedDict()
 
     @handle_embedding_errors(model_type="word2vec")
     def load(self) -> bool:
@@ -600,10 +1230,9 @@ class Word2VecEmbeddingsModel(EmbeddingsModel):
             del self._model
             self._model = None
             self.is_loaded_flag = False
+            self._embed_cache.clear()
 
             # Force garbage collection
-            import gc
-
             gc.collect()
 
             logger.info("Unloaded Word2Vec model")
@@ -647,7 +1276,23 @@ class Word2VecEmbeddingsModel(EmbeddingsModel):
                 logger.warning(f"Error during tokenization preprocessing: {e}")
 
         # Default preprocessing: lowercase and normalize whitespace
-        return " ".join(text.lower().split())
+        return _normalize_text(text)
+
+    def _get_indices(self, words: list[str]) -> np.ndarray:
+        """Map words to rows of the model's vector matrix.
+
+        Reads gensim's key_to_index directly, with one dictionary lookup per
+        word, instead of going through KeyedVectors membership and indexing.
+
+        Args:
+            words: Words to look up.
+
+        Returns:
+            np.ndarray: int64 row indices, -1 for out-of-vocabulary words.
+
+        """
+        key_to_index = self._model.key_to_index
+        return np.fromiter((key_to_index.get(word, -1) for word in words), dtype=np.int64, count=len(words))
 
     @safe_embed(logger)
     def embed_text(self, text: str) -> Optional[np.ndarray]:
@@ -672,43 +1317,26 @@ class Word2VecEmbeddingsModel(EmbeddingsModel):
 
         if not text:
             # Return zero vector for empty text
-            return np.zeros(self.dim)
+            return _zero_vector(self.dim)
 
         try:
             # Preprocess text
-            processed_text = self.preprocess_text(text)
-
-            # Limit text length to prevent memory issues
-            max_text_length = 100000
-            if len(processed_text) > max_text_length:
-                logger.warning(f"Text length ({len(processed_text)}) exceeds maximum " f"({max_text_length}). Truncating.")
-                processed_text = processed_text[:max_text_length]
-
-            words = processed_text.split()
-
+            words = _text_to_words(text, self.tokenization_model, self.preprocess_text)
             if not words:
-                return np.zeros(self.dim)
+                return _zero_vector(self.dim)
 
-            # Average word vectors
-            vectors = []
-            for word in words:
-                try:
-                    if word in self._model:
-                        vectors.append(self._model[word])
-                except Exception:
-                    pass
-
-            if vectors:
-                vector = np.mean(vectors, axis=0)
+            # Limit text length to prevent memory issues
+            if len(words) > MAX_TEXT_WORDS:
+                logger.warning(f"Text length ({len(words)} words) exceeds maximum ({MAX_TEXT_WORDS}). Truncating.")
+                words = words[:MAX_TEXT_WORDS]
 
-                # Check for NaN values in the vector
-                if np.isnan(vector).any():
-                    logger.warning("NaN values detected in embedding vector. " "Replacing with zeros.")
-                    vector = np.nan_to_num(vector)
+            # Average the rows of known words
+            vector = mean_embedding(self._model.vectors, self._get_indices(words))
 
-                return vector
+            if vector is not None:
+                return _replace_non_finite(vector)
             else:
-                return np.zeros(self.dim)
+                return _zero_vector(self.dim)
 
         except Exception as e:
             raise EmbeddingError(
@@ -734,18 +1362,48 @@ class Word2VecEmbeddingsModel(EmbeddingsModel):
                 logger.error("Failed to load model for batch embedding")
                 return [None] * len(texts)
 
-        results = []
+        results: list[np.ndarray | None] = [None] * len(texts)
         error_count = 0
         max_reported_errors = 5
 
+        # Serve repeated texts from the cache and embed each unique text once
+        pending: dict[str, list[int]] = {}
         for i, text in enumerate(texts):
-            try:
-                results.append(self.embed_text(text))
-            except EmbeddingError as e:
-                error_count += 1
-                if error_count <= max_reported_errors:
-                    logger.error(f"Error embedding text {i}: {e.message}")
-                results.append(None)
+            cached = self._embed_cache.get(text)
+            if cached is not None:
+                self._embed_cache.move_to_end(text)
+                results[i] = cached
+            else:
+                pending.setdefault(text, []).append(i)
+
+        # Word vector models embed all unique texts with a single gather
+        batch_vectors = _embed_batch_gather(
+            list(pending), lambda text: _text_to_words(text, self.tokenization_model, self.preprocess_text), self._model.vectors, self._get_indices
+        )
+
+        for n, (text, positions) in enumerate(pending.items()):
+            if batch_vectors is not None:
+                vector = batch_vectors[n]
+            else:
+                try:
+                    vector = self.embed_text(text)
+                except EmbeddingError as e:
+                    error_count += 1
+                    if error_count <= max_reported_errors:
+                        logger.error(f"Error embedding text {positions[0]}: {e.message}")
+                    continue
+
+            if vector is not None:
+                # Rows of the gathered batch are views; cache a read-only copy so
+                # neither the batch nor a caller can change what later hits return
+                vector = vector.copy()
+                vector.setflags(write=False)
+                self._embed_cache[text] = vector
+                if len(self._embed_cache) > EMBEDDING_CACHE_SIZE:
+                    self._embed_cache.popitem(last=False)
+
+            for i in positions:
+                results[i] = vector
 
         if error_count > max_reported_errors:
             logger.error(f"{error_count - max_reported_errors} more embedding errors suppressed")
@@ -768,6 +1426,21 @@ class Word2VecEmbeddingsModel(EmbeddingsModel):
         return self.dim
 
 
+# Padded tokens per batch for SentenceTransformers on CPU, and per GB of free GPU memory
+CPU_TOKEN_BUDGET = 16_384
+TOKENS_PER_GB = 8_192
+
+# Maximum number of texts in one SentenceTransformers batch
+MAX_BATCH_TEXTS = 256
+
+# UTF-8 bytes per token used to estimate text lengths when planning batches:
+# about 4 for Latin scripts and 3 for CJK, so this leans toward smaller batches
+UTF8_BYTES_PER_TOKEN = 3
+
+# Number of texts from which embed_batch spreads the work over all GPUs
+MULTI_GPU_MIN_TEXTS = 1024
+
+
 class SentenceTransformersEmbeddingsModel(EmbeddingsModel):
     """SentenceTransformers implementation of text embedding model.
 
@@ -778,20 +1451,34 @@ class SentenceTransformersEmbeddingsModel(EmbeddingsModel):
         model_path (str): Path or name of the SentenceTransformers model.
         max_length (int): Maximum sequence length for input texts.
         dim (int): Dimension of embeddings, determined after model loading.
+        single_call_batching (bool): Whether concurrent embed_text calls are encoded together.
+        use_bf16 (bool): Whether the transformer runs in bfloat16 on GPUs that support it.
 
     """
 
-    def __init__(self, model_path: str, max_length: int = 512):
+    def __init__(self, model_path: str, max_length: int = 512, single_call_batching: bool = False, use_bf16: bool = False):
         """Initialize the SentenceTransformers model.
 
         Args:
             model_path: Path or name of the SentenceTransformers model.
             max_length: Maximum sequence length for tokenization.
+            single_call_batching: Encode embed_text calls made concurrently from
+                several threads in shared batches instead of one by one.
+            use_bf16: Cast the transformer weights to bfloat16 when running on an
+                Ampere or newer GPU; pooling still runs in float32. Off by default,
+                since embeddings then differ slightly from float32 ones.
 
         """
         self.model_path = model_path
         self.max_length = max_length
-        self._model = None
+        self.single_call_batching = single_call_batching
+        self.use_bf16 = use_bf16
+        self._model: Any = None
+        self._batcher: RequestBatcher | None = None
+        self._pool = None
+        self._pool_checked = False
+        self._bf16_active = False
+        self._cuda_available = False
         self.dim = 0
         self.is_loaded_flag = False
 
@@ -824,10 +1511,14 @@ class SentenceTransformersEmbeddingsModel(EmbeddingsModel):
                     self.model_path,
                 )
 
+            # Must run before the memory check below initializes CUDA
+            configure_cuda_allocator()
+
+            self._cuda_available = TORCH_AVAILABLE and torch.cuda.is_available()
+
             # Check if we have enough memory for loading
             try:
                 import psutil
-                import torch
 
                 # Rough estimate of memory requirements
                 required_memory_gb = 2.0  # Default estimate for medium models
@@ -838,7 +1529,7 @@ class SentenceTransformersEmbeddingsModel(EmbeddingsModel):
                     required_memory_gb = 1.5
 
                 available_memory_gb = psutil.virtual_memory().available / (1024**3)
-                if torch.cuda.is_available():
+                if self._cuda_available:
                     device = torch.cuda.current_device()
                     gpu_memory_gb = torch.cuda.get_device_properties(device).total_memory / (1024**3)
                     logger.info(f"Using GPU with {gpu_memory_gb:.2f} GB memory")
@@ -857,9 +1548,16 @@ class SentenceTransformersEmbeddingsModel(EmbeddingsModel):
                     self._model.max_seq_length = self.max_length
                     logger.info(f"Set maximum sequence length to {self.max_length}")
 
-                # Get embedding dimension
-                test_embedding = self._model.encode("test", convert_to_numpy=True)
-                self.dim = test_embedding.shape[0]
+                if self.use_bf16:
+                    self._cast_to_bf16()
+
+                # Read the embedding dimension from the model instead of running a probe forward pass
+                self.dim = self._model.get_sentence_embedding_dimension()
+                if self.dim is None:
+                    self.dim = self._model[0].auto_model.config.hidden_size
+
+                if self.single_call_batching:
+                    self._batcher = RequestBatcher(lambda texts: self._encode(texts, convert_to_numpy=True), name="encode-batcher")
 
                 self.is_loaded_flag = True
                 logger.info(f"Loaded SentenceTransformers model with dimension {self.dim}")
@@ -896,6 +1594,78 @@ class SentenceTransformersEmbeddingsModel(EmbeddingsModel):
                 details={"error_type": type(e).__name__},
             ) from e
 
+    def _encode(self, texts: str | list[str], **kwargs: Any) -> Any:
+        """Run the SentenceTransformers encoder without autograd tracking.
+
+        Args:
+            texts: Text or list of texts to encode.
+            **kwargs: Keyword arguments passed to SentenceTransformer.encode.
+
+        Returns:
+            The embeddings returned by SentenceTransformer.encode.
+
+        """
+        with torch.inference_mode() if TORCH_AVAILABLE else contextlib.nullcontext():
+            return self._model.encode(texts, **kwargs)
+
+    def _get_multi_gpu_pool(self) -> dict | None:
+        """Get the pool of one encoding worker per GPU, starting it on first use.
+
+        The pool is only used when the model runs in float32: workers get a
+        float32 copy of the model, and a bfloat16 model would embed the same
+        text differently depending on the size of the call.
+
+        Returns:
+            Optional[dict]: The worker pool, or None to encode on a single device.
+
+        """
+        if self._pool is not None or self._pool_checked:
+            return self._pool
+        self._pool_checked = True
+
+        if not self._cuda_available or torch.cuda.device_count() < 2:
+            return None
+        if self._bf16_active:
+            logger.info("Model runs in bfloat16, encoding large batches on a single GPU")
+            return None
+
+        try:
+            self._pool = self._model.start_multi_process_pool()
+            logger.info(f"Started SentenceTransformers workers on {torch.cuda.device_count()} GPUs")
+        except Exception as e:
+            logger.warning(f"Could not start multi-GPU encoding pool, using a single device: {e}")
+            self._pool = None
+
+        return self._pool
+
+    def _cast_to_bf16(self) -> None:
+        """Run the transformer in bfloat16 on GPUs with native bfloat16 support.
+
+        Halves the weight memory traffic of the forward pass. Token embeddings
+        are cast back to float32 before pooling, so the mean and normalization
+        are computed at full precision.
+        """
+        if not self._cuda_available or self._model.device.type != "cuda" or torch.cuda.get_device_capability(self._model.device)[0] < 8:
+            return
+
+        try:
+            from sentence_transformers.models import Pooling, Transformer
+
+            def upcast_token_embeddings(module: Any, args: tuple) -> None:
+                features = args[0]
+                features["token_embeddings"] = features["token_embeddings"].float()
+
+            for module in self._model:
+                if isinstance(module, Transformer):
+                    module.auto_model.to(dtype=torch.bfloat16)
+                elif isinstance(module, Pooling):
+                    module.register_forward_pre_hook(upcast_token_embeddings)
+
+            self._bf16_active = True
+            logger.info("Running SentenceTransformers model in bfloat16")
+        except Exception as e:
+            logger.warning(f"Could not cast SentenceTransformers model to bfloat16, keeping float32: {e}")
+
     @handle_embedding_errors(model_type="sentence_transformers")
     def unload(self) -> bool:
         """Unload the SentenceTransformers model from memory.
@@ -905,22 +1675,25 @@ class SentenceTransformersEmbeddingsModel(EmbeddingsModel):
 
         """
         if hasattr(self, "_model") and self._model is not None:
+            if self._batcher is not None:
+                self._batcher.close()
+                self._batcher = None
+
+            if self._pool is not None:
+                self._model.stop_multi_process_pool(self._pool)
+                self._pool = None
+            self._pool_checked = False
+            self._bf16_active = False
+
             del self._model
             self._model = None
             self.is_loaded_flag = False
 
             # Force GPU memory cleanup if available
-            try:
-                import torch
-
-                if torch.cuda.is_available():
-                    torch.cuda.empty_cache()
-            except ImportError:
-                pass
+            if self._cuda_available:
+                torch.cuda.empty_cache()
 
             # Force garbage collection
-            import gc
-
             gc.collect()
 
             logger.info("Unloaded SentenceTransformers model")
@@ -960,7 +1733,7 @@ class SentenceTransformersEmbeddingsModel(EmbeddingsModel):
 
         if not text:
             # Return zero vector for empty text
-            return np.zeros(self.dim)
+            return _zero_vector(self.dim)
 
         try:
             # Check for very long texts that might cause memory issues
@@ -972,26 +1745,21 @@ class SentenceTransformersEmbeddingsModel(EmbeddingsModel):
 
             # Encode text with SentenceTransformers
             try:
-                vector = self._model.encode(text, convert_to_numpy=True)
-
-                # Check for NaN values in the vector
-                if np.isnan(vector).any():
-                    logger.warning("NaN values detected in embedding vector. " "Replacing with zeros.")
-                    vector = np.nan_to_num(vector)
-
-                return vector
+                if self._batcher is not None:
+                    vector = self._batcher.submit(text).result()
+                else:
+                    vector = self._encode(text, convert_to_numpy=True)
+                return _replace_non_finite(vector)
             except RuntimeError as e:
                 if "CUDA out of memory" in str(e) or "out of memory" in str(e).lower():
                     # Try to recover from out of memory by clearing GPU cache
                     try:
-                        import torch
-
-                        if torch.cuda.is_available():
+                        if self._cuda_available:
                             torch.cuda.empty_cache()
                             logger.warning("CUDA out of memory. Cleared cache and retrying with shorter input...")
                             # Retry with shorter input
                             shorter_text = text[: len(text) // 2]
-                            return self._model.encode(shorter_text, convert_to_numpy=True)
+                            return _replace_non_finite(self._encode(shorter_text, convert_to_numpy=True))
                     except Exception:
                         pass
 
@@ -1010,7 +1778,9 @@ class SentenceTransformersEmbeddingsModel(EmbeddingsModel):
     def embed_batch(self, texts: list[str]) -> list[Optional[np.ndarray]]:
         """Generate embeddings for a batch of texts.
 
-        Uses adaptive batch sizes based on text lengths to avoid memory issues.
+        Texts are sorted by length and packed into batches that fit a token
+        budget, so batches carry little padding and long texts cannot run the
+        device out of memory.
 
         Args:
             texts: List of texts to embed.
@@ -1040,28 +1810,41 @@ class SentenceTransformersEmbeddingsModel(EmbeddingsModel):
                     valid_texts.append(text)
 
             # Create result list with None for empty texts
-            results = [None] * len(texts)
-
-            if valid_texts:
-                # Use adaptive batch sizes based on text lengths to avoid memory issues
-                batch_size = self._determine_batch_size(valid_texts)
-                logger.debug(f"Using batch size of {batch_size} for {len(valid_texts)} texts")
-
-                # Process in smaller batches
-                for start_idx in range(0, len(valid_texts), batch_size):
-                    end_idx = min(start_idx + batch_size, len(valid_texts))
-                    batch_texts = valid_texts[start_idx:end_idx]
-                    batch_indices = valid_indices[start_idx:end_idx]
+            results: list[np.ndarray | None] = [None] * len(texts)
+
+            pool = self._get_multi_gpu_pool() if len(valid_texts) >= MULTI_GPU_MIN_TEXTS else None
+            if pool is not None:
+                # Large batches are split across the GPUs by the worker pool
+                batch_size = max(1, min(MAX_BATCH_TEXTS, self._token_budget() // self.max_length))
+                vectors = _replace_non_finite(self._model.encode_multi_process(valid_texts, pool, batch_size=batch_size))
+                for i, vector in zip(valid_indices, vectors, strict=True):
+                    results[i] = vector
+
+            elif valid_texts:
+                # Pack texts of similar length into batches that fit a token budget
+                batches = self._plan_batches(valid_texts)
+                logger.debug(f"Planned {len(batches)} batches for {len(valid_texts)} texts")
+
+                # On GPU, keep batch outputs on the device and copy them to the host once
+                on_gpu = getattr(self._model, "device", None) is not None and self._model.device.type == "cuda"
+                device_indices = []
+                device_vectors = []
+
+                for batch_num, batch in enumerate(batches):
+                    batch_texts = [valid_texts[j] for j in batch]
+                    batch_indices = [valid_indices[j] for j in batch]
 
                     try:
                         # Encode batch with SentenceTransformers
-                        batch_vectors = self._model.encode(batch_texts, convert_to_numpy=True)
+                        if on_gpu:
+                            device_vectors.append(self._encode(batch_texts, batch_size=len(batch_texts), convert_to_tensor=True))
+                            device_indices.extend(batch_indices)
+                            continue
+
+                        batch_vectors = _replace_non_finite(self._encode(batch_texts, batch_size=len(batch_texts), convert_to_numpy=True))
 
                         # Put vectors back in the original order
                         for i, vector in zip(batch_indices, batch_vectors):
-                            if np.isnan(vector).any():
-                                logger.warning(f"NaN values in vector for text {i}. Replacing with zeros.")
-                                vector = np.nan_to_num(vector)
                             results[i] = vector
 
                     except RuntimeError as e:
@@ -1070,29 +1853,30 @@ class SentenceTransformersEmbeddingsModel(EmbeddingsModel):
                             logger.warning(f"CUDA out of memory with batch size {len(batch_texts)}. " f"Trying to recover...")
 
                             try:
-                                import torch
-
-                                if torch.cuda.is_available():
+                                if self._cuda_available:
                                     torch.cuda.empty_cache()
 
                                 # Process one by one for this batch
                                 for i, text in zip(batch_indices, batch_texts):
                                     try:
-                                        vector = self._model.encode(text, convert_to_numpy=True)
-                                        if np.isnan(vector).any():
-                                            vector = np.nan_to_num(vector)
-                                        results[i] = vector
+                                        results[i] = _replace_non_finite(self._encode(text, convert_to_numpy=True))
                                     except Exception as inner_e:
                                         logger.error(f"Error embedding text {i}: {inner_e}")
                             except Exception:
-                                logger.error(f"Failed to recover from memory error in batch {start_idx}:{end_idx}")
+                                logger.error(f"Failed to recover from memory error in batch {batch_num}")
                         else:
-                            logger.error(f"Error in batch {start_idx}:{end_idx}: {e}")
+                            logger.error(f"Error in batch {batch_num}: {e}")
+
+                if device_vectors:
+                    all_vectors = _replace_non_finite(torch.cat(device_vectors, dim=0).float().cpu().numpy())
+                    for i, vector in zip(device_indices, all_vectors, strict=True):
+                        results[i] = vector
 
-                # Fill in zeros for empty texts
+            # Fill in zeros for empty texts
+            if valid_texts:
                 for i in range(len(texts)):
                     if results[i] is None:
-                        results[i] = np.zeros(self.dim)
+                        results[i] = _zero_vector(self.dim)
 
             return results
 
@@ -1100,58 +1884,70 @@ class SentenceTransformersEmbeddingsModel(EmbeddingsModel):
             logger.error(f"Error embedding batch: {e}")
             return [None] * len(texts)
 
-    def _determine_batch_size(self, texts: list[str]) -> int:
-        """Determine an appropriate batch size based on text lengths.
+    def _estimate_tokens(self, texts: list[str]) -> list[int]:
+        """Estimate the tokens of each text, truncated to the maximum sequence length.
+
+        Uses the UTF-8 size of the text rather than the tokenizer, which
+        encode() runs anyway; the estimate errs on the high side for Latin
+        scripts and is close for CJK, where a character is about one token.
 
         Args:
-            texts: List of texts to process.
+            texts: List of texts to measure.
 
         Returns:
-            int: Recommended batch size.
+            List[int]: Estimated token count of each text.
 
         """
-        if not texts:
-            return 16  # Default for empty list
-
-        # Calculate average text length
-        avg_length = sum(len(text) for text in texts) / len(texts)
-
-        # Initialize default batch size based on text length
-        batch_size = 32  # Default value
-
-        # Adjust batch size based on text length - these are heuristics
-        if avg_length > 10000:
-            batch_size = 1  # Very long texts, process one by one
-        elif avg_length > 5000:
-            batch_size = 2  # Long texts
-        elif avg_length > 1000:
-            batch_size = 8  # Medium long texts
-        elif avg_length > 500:
-            batch_size = 16  # Medium texts
-        else:
-            batch_size = 32  # Short texts
+        return [min(len(text.encode("utf-8")) // UTF8_BYTES_PER_TOKEN + 2, self.max_length) for text in texts]
 
-        # Check GPU memory if available
-        try:
-            import torch
-
-            if torch.cuda.is_available():
-                device = torch.cuda.current_device()
-                gpu_memory_gb = torch.cuda.get_device_properties(device).total_memory / (1024**3)
-
-                # Scale batch size based on GPU memory
-                if gpu_memory_gb < 4:
-                    return min(8, batch_size)  # Small GPU
-                elif gpu_memory_gb < 8:
-                    return min(16, batch_size)  # Medium GPU
-                elif gpu_memory_gb < 16:
-                    return min(32, batch_size)  # Large GPU
-                else:
-                    return min(64, batch_size)  # Very large GPU
-        except Exception:
-            pass
+    def _token_budget(self) -> int:
+        """Get the number of padded tokens a single batch may contain.
+
+        Scales with the free memory of the GPU, and is fixed on CPU.
+
+        Returns:
+            int: Token budget per batch.
+
+        """
+        budget = CPU_TOKEN_BUDGET
+        if self._cuda_available:
+            try:
+                free_memory_gb = torch.cuda.mem_get_info()[0] / (1024**3)
+                budget = int(free_memory_gb * TOKENS_PER_GB)
+            except Exception:
+                pass
+
+        # Always allow at least one text of maximum length
+        return max(budget, self.max_length)
+
+    def _plan_batches(self, texts: list[str]) -> list[list[int]]:
+        """Split texts into batches of similar length within a token budget.
+
+        Texts are sorted by estimated token count and packed greedily while the
+        padded size of the batch (its length times its longest text) fits the budget.
+
+        Args:
+            texts: List of texts to process.
 
-        return batch_size
+        Returns:
+            List[List[int]]: Positions in ``texts`` of each batch.
+
+        """
+        token_counts = self._estimate_tokens(texts)
+        budget = self._token_budget()
+
+        batches = []
+        batch: list[int] = []
+        for j in sorted(range(len(texts)), key=token_counts.__getitem__):
+            # Sorted ascending, so the text being added is the longest of the batch
+            if batch and ((len(batch) + 1) * token_counts[j] > budget or len(batch) >= MAX_BATCH_TEXTS):
+                batches.append(batch)
+                batch = []
+            batch.append(j)
+        if batch:
+            batches.append(batch)
+
+        return batches
 
     def get_dimension(self) -> int:
         """Get the dimensionality of the embedding vectors.
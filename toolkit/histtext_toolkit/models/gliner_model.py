@@ -4,11 +4,18 @@ This module provides an implementation of NERModel using the GLiNER library
 for zero-shot and few-shot named entity recognition.
 """
 
-
+import contextlib
+import gc
+import threading
+from collections.abc import Iterator
+from concurrent.futures import Future
+from typing import Any
+
+import numpy as np
 import torch
 
 from ..core.logging import get_logger
-from .base import Entity, NERModel
+from .base import Entity, NERModel, RequestBatcher, configure_cuda_allocator
 
 logger = get_logger(__name__)
 
@@ -22,6 +29,18 @@ except ImportError:
     GLINER_AVAILABLE = False
 
 
+# Reserved CUDA memory below which empty_cache() is not worth the device sync
+GPU_CACHE_RELEASE_THRESHOLD = 1 << 28  # 256 MB
+
+# Number of full-size document chunks sent to GLiNER in one batched call;
+# batches of shorter chunks hold more of them, up to MAX_CHUNK_BATCH
+CHUNK_BATCH_SIZE = 16
+MAX_CHUNK_BATCH = 64
+
+# Characters shared by consecutive chunks of a document (about one entity), so an
+# entity cut by a chunk boundary is still seen whole by the next chunk
+CHUNK_OVERLAP = 48
+
 # Default mapping from GLiNER labels to short codes
 DEFAULT_LABEL_MAPPING = {
     "Person": "P",
@@ -58,9 +77,18 @@ class GLiNERModel(NERModel):
         threshold (float): Confidence threshold for entity detection.
         device (str): Device used for processing ('cuda' or 'cpu').
         label_mapping (Dict[str, str]): Mapping from GLiNER labels to short codes.
+        use_compile (bool): Whether the model is compiled with torch.compile on GPU.
+        dtype (str): Precision of the forward pass on GPU.
+        use_sdpa (bool): Whether the encoder uses fused scaled dot-product attention when supported.
 
     """
 
+    # Loaded GLiNER instances shared between wrappers, keyed by _cache_key(); the
+    # lock is held while a model is loaded, so concurrent loads of one key load it once
+    _MODEL_CACHE: dict[tuple, "GLiNER"] = {}
+    _MODEL_REFCOUNT: dict[tuple, int] = {}
+    _MODEL_CACHE_LOCK = threading.Lock()
+
     def __init__(
         self,
         model_path: str,
@@ -68,6 +96,9 @@ class GLiNERModel(NERModel):
         threshold: float = 0.5,
         use_gpu: bool = None,
         label_mapping: dict[str, str] = None,
+        use_compile: bool = False,
+        dtype: str = "float32",
+        use_sdpa: bool = True,
     ):
         """Initialize the GLiNER model.
 
@@ -77,6 +108,13 @@ class GLiNERModel(NERModel):
             threshold: Confidence threshold for entity detection (0.0 to 1.0).
             use_gpu: Force GPU usage if True, CPU if False, auto-detect if None.
             label_mapping: Custom mapping from GLiNER labels to short codes.
+            use_compile: Compile the model with torch.compile on GPU. Cuts per-chunk
+                launch overhead on large corpora, but the first calls are slow.
+            dtype: Precision of the forward pass on GPU: 'float32', 'float16' or
+                'bfloat16' (falls back to float16 on GPUs without bfloat16 support).
+                Defaults to float32; reduced precision can shift entity scores.
+            use_sdpa: Load the encoder with PyTorch's fused scaled dot-product attention
+                when its architecture supports it.
 
         Raises:
             ImportError: If GLiNER is not installed.
@@ -90,9 +128,18 @@ class GLiNERModel(NERModel):
         self.threshold = threshold
         self.use_gpu = use_gpu
         self.label_mapping = label_mapping or DEFAULT_LABEL_MAPPING
-        self._model = None
+        self.use_compile = use_compile
+        self.dtype = dtype
+        self.use_sdpa = use_sdpa
+        self._autocast_dtype: torch.dtype | None = None
+        self._model: Any = None
+        self._labels = list(self.label_mapping.keys())
+        self._label_embeddings = None
+        self._batcher: RequestBatcher | None = None
+        self._batcher_lock = threading.Lock()
 
         # Determine device
+        self.device: str
         if self.use_gpu is None:
             self.device = "cuda" if torch.cuda.is_available() else "cpu"
         else:
@@ -102,6 +149,7 @@ class GLiNERModel(NERModel):
         """Load the GLiNER model.
 
         Loads the model from the specified path and sets it to the appropriate device.
+        Instances with the same model path and device share one loaded model.
 
         Returns:
             bool: True if model loaded successfully, False otherwise.
@@ -111,23 +159,150 @@ class GLiNERModel(NERModel):
             logger.error("GLiNER is not installed")
             return False
 
+        if self._model is not None:
+            return True
+
+        configure_cuda_allocator()
+        self._autocast_dtype = self._resolve_autocast_dtype()
+
+        key = self._cache_key()
+        with GLiNERModel._MODEL_CACHE_LOCK:
+            if key in GLiNERModel._MODEL_CACHE:
+                self._model = GLiNERModel._MODEL_CACHE[key]
+                GLiNERModel._MODEL_REFCOUNT[key] += 1
+                logger.info(f"Reusing loaded GLiNER model {self.model_path} on {self.device}")
+            else:
+                try:
+                    self._model = self._from_pretrained()
+
+                    # Set default values for tokenizer parameters
+                    if hasattr(self._model, "tokenizer") and self._model.tokenizer is not None:
+                        self._model.tokenizer.model_max_length = 512
+
+                    self._model.to(self.device)
+                    self._model.eval()
+
+                    # Inference only: drop autograd bookkeeping on the weights
+                    for param in self._model.parameters():
+                        param.requires_grad_(False)
+
+                    if self.use_compile:
+                        self._compile()
+
+                    GLiNERModel._MODEL_CACHE[key] = self._model
+                    GLiNERModel._MODEL_REFCOUNT[key] = 1
+                    logger.info(f"Loaded GLiNER model from {self.model_path} on {self.device}")
+                except Exception as e:
+                    self._model = None
+                    logger.error(f"Failed to load GLiNER model: {e}")
+                    return False
+
+        self._encode_labels()
+        return True
+
+    def _cache_key(self) -> tuple:
+        """Get the key under which this instance's loaded model is shared.
+
+        Returns:
+            tuple: The model path, device and the options that change the loaded model.
+
+        """
+        return (self.model_path, self.device, self.use_compile, self.use_sdpa)
+
+    def _from_pretrained(self) -> "GLiNER":
+        """Load the GLiNER model, with fused SDPA attention if requested and supported.
+
+        Returns:
+            GLiNER: The loaded model.
+
+        """
+        kwargs = {"use_auth_token": False, "trust_remote_code": True}
+
+        if self.use_sdpa:
+            try:
+                return GLiNER.from_pretrained(self.model_path, _attn_implementation="sdpa", **kwargs)
+            except (TypeError, ValueError) as e:
+                # Older GLiNER versions and encoders such as DeBERTa do not support SDPA
+                logger.debug(f"SDPA attention not available for {self.model_path}, using the default: {e}")
+
+        return GLiNER.from_pretrained(self.model_path, **kwargs)
+
+    def _resolve_autocast_dtype(self) -> torch.dtype | None:
+        """Get the reduced precision dtype to autocast GPU forward passes to, if any.
+
+        Returns:
+            Optional[torch.dtype]: float16 or bfloat16, or None to run in float32.
+
+        """
+        if self.device != "cuda" or self.dtype == "float32":
+            return None
+        if self.dtype == "bfloat16" and torch.cuda.is_bf16_supported():
+            return torch.bfloat16
+        if self.dtype not in ("float16", "bfloat16"):
+            logger.warning(f"Unknown GLiNER dtype '{self.dtype}', using float16")
+        return torch.float16
+
+    def _compile(self) -> None:
+        """Compile the GLiNER network with CUDA graphs to cut per-call launch overhead."""
+        if self.device != "cuda" or not hasattr(torch, "compile") or not hasattr(self._model, "model"):
+            return
+
         try:
-            self._model = GLiNER.from_pretrained(
-                self.model_path,
-                use_auth_token=False,
-                trust_remote_code=True,
-            )
+            self._model.model = torch.compile(self._model.model, mode="reduce-overhead", dynamic=True)
+        except Exception as e:
+            logger.warning(f"Could not compile GLiNER model, running it eagerly: {e}")
+            return
+
+        # Compile during load rather than on the first documents, for the batch shapes used later
+        try:
+            for batch_size in (1, CHUNK_BATCH_SIZE):
+                for length in (self.max_chunk_size // 2, self.max_chunk_size):
+                    self._predict(["a " * (length // 2)] * batch_size)
+            logger.info("Compiled GLiNER model with torch.compile")
+        except Exception as e:
+            logger.warning(f"GLiNER compilation warm-up failed: {e}")
 
-            # Set default values for tokenizer parameters
-            if hasattr(self._model, "tokenizer") and self._model.tokenizer is not None:
-                self._model.tokenizer.model_max_length = 512
+    def _encode_labels(self) -> None:
+        """Precompute label embeddings for bi-encoder GLiNER models.
 
-            self._model.to(self.device)
-            logger.info(f"Loaded GLiNER model from {self.model_path} on {self.device}")
-            return True
+        Bi-encoder models embed labels separately from the text, so the
+        fixed label set can be encoded once instead of for every chunk.
+        Uni-encoder models read labels and text in the same sequence and
+        keep predicting from the label strings.
+        """
+        self._label_embeddings = None
+
+        config = getattr(self._model, "config", None)
+        if not getattr(config, "labels_encoder", None) or not hasattr(self._model, "batch_predict_with_embeds"):
+            return
+
+        try:
+            with torch.inference_mode():
+                self._label_embeddings = self._model.encode_labels(self._labels)
+            logger.debug(f"Precomputed embeddings for {len(self._labels)} GLiNER labels")
         except Exception as e:
-            logger.error(f"Failed to load GLiNER model: {e}")
-            return False
+            logger.debug(f"Could not precompute GLiNER label embeddings: {e}")
+
+    def _predict(self, texts: list[str]) -> list[list[dict]]:
+        """Run GLiNER on a list of texts with the configured labels.
+
+        Args:
+            texts: Texts to analyze.
+
+        Returns:
+            List[List[dict]]: GLiNER entity predictions for each text.
+
+        """
+        autocast = torch.autocast("cuda", dtype=self._autocast_dtype) if self._autocast_dtype is not None else contextlib.nullcontext()
+        predictions: list[list[dict]]
+        with torch.inference_mode(), autocast:
+            if self._label_embeddings is not None:
+                predictions = self._model.batch_predict_with_embeds(texts, self._label_embeddings, self._labels, threshold=self.threshold)
+            elif len(texts) > 1 and hasattr(self._model, "batch_predict_entities"):
+                predictions = self._model.batch_predict_entities(texts, self._labels, threshold=self.threshold)
+            else:
+                predictions = [self._model.predict_entities(text, self._labels, threshold=self.threshold) for text in texts]
+        return predictions
 
     def unload(self) -> bool:
         """Unload the GLiNER model from memory.
@@ -136,13 +311,41 @@ class GLiNERModel(NERModel):
             bool: True if successful, False otherwise.
 
         """
-        if hasattr(self, "_model") and self._model is not None:
-            del self._model
+        if self._batcher is not None:
+            self._batcher.close()
+            self._batcher = None
+        self.release_shared()
+        self._label_embeddings = None
+        return True
+
+    def release_shared(self) -> bool:
+        """Drop this instance's reference to the shared GLiNER model.
+
+        The underlying model is freed, and the GPU cache released, only when
+        the last instance using it lets go.
+
+        Returns:
+            bool: True if the shared model was freed, False if other instances still use it.
+
+        """
+        if self._model is None:
+            return False
 
+        key = self._cache_key()
         self._model = None
 
-        # Force GPU memory cleanup if available
-        if torch.cuda.is_available():
+        with GLiNERModel._MODEL_CACHE_LOCK:
+            refcount = GLiNERModel._MODEL_REFCOUNT.get(key, 1) - 1
+            if refcount > 0:
+                GLiNERModel._MODEL_REFCOUNT[key] = refcount
+                return False
+
+            GLiNERModel._MODEL_CACHE.pop(key, None)
+            GLiNERModel._MODEL_REFCOUNT.pop(key, None)
+
+        # Release cached GPU blocks only if this model actually held some
+        if self.device == "cuda" and torch.cuda.memory_reserved() > GPU_CACHE_RELEASE_THRESHOLD:
+            gc.collect()
             torch.cuda.empty_cache()
 
         return True
@@ -160,8 +363,9 @@ class GLiNERModel(NERModel):
     def extract_entities(self, text: str) -> list[Entity]:
         """Extract named entities from text using GLiNER.
 
-        Processes the text in chunks to handle long documents and extracts
-        entities based on the configured threshold.
+        Splits the text into chunks to handle long documents and runs them
+        through GLiNER in batches, extracting entities based on the
+        configured threshold. Chunks of a failing batch are retried one by one.
 
         Args:
             text: Input text to analyze.
@@ -169,37 +373,248 @@ class GLiNERModel(NERModel):
         Returns:
             List[Entity]: List of extracted entities with their positions and labels.
 
+        """
+        return self.extract_entities_batch([text])[0]
+
+    def extract_entities_async(self, text: str) -> Future:
+        """Queue a text for entity extraction alongside concurrent callers.
+
+        Texts submitted from several threads while a batch is running are
+        extracted together in the next call to extract_entities_batch, so
+        request-per-document callers share GLiNER forward passes.
+
+        Args:
+            text: Input text to analyze.
+
+        Returns:
+            Future: Resolves to the text's list of entities, or to the extraction error.
+
+        """
+        if self._batcher is None:
+            with self._batcher_lock:
+                if self._batcher is None:
+                    self._batcher = RequestBatcher(self.extract_entities_batch, max_batch=MAX_CHUNK_BATCH, name="gliner-batcher")
+        return self._batcher.submit(text)
+
+    def extract_entities_batch(self, texts: list[str]) -> list[list[Entity]]:
+        """Extract named entities from several texts using GLiNER.
+
+        The chunks of all texts are pooled and packed into batches of
+        similar length, so short texts share GLiNER batches instead of each
+        paying for a forward pass, and batches carry little padding.
+
+        Args:
+            texts: Input texts to analyze.
+
+        Returns:
+            List[List[Entity]]: Extracted entities of each text, empty for blank texts.
+
         """
         if not self.is_loaded:
             if not self.load():
-                return []
+                return [[] for _ in texts]
+
+        # Chunks are kept as spans and only sliced out of their text when their batch runs
+        chunks = [(i, start, end) for i, text in enumerate(texts) if text for start, end in self._iter_chunks(text)]
+        chunk_entities: list[list[Entity]] = [[] for _ in chunks]
+
+        for batch in self._plan_batches([end - start for _, start, end in chunks]):
+            try:
+                predictions = self._predict([texts[i][start:end] for i, start, end in (chunks[j] for j in batch)])
+            except Exception as e:
+                # Fall back to chunk-by-chunk processing with smaller retries
+                logger.debug(f"GLiNER batch of {len(batch)} chunks failed, retrying chunk by chunk: {e}")
+                if "out of memory" in str(e).lower() and torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+                for j in batch:
+                    i, start, end = chunks[j]
+                    chunk_entities[j] = self._extract_with_retry(texts[i], start, end)
+                continue
+
+            for j, chunk_ents in zip(batch, predictions, strict=True):
+                chunk_entities[j] = self._to_entities(chunk_ents, chunks[j][1])
+
+        # Reassemble entities in document order
+        doc_chunks: list[list[tuple[int, int, list[Entity]]]] = [[] for _ in texts]
+        for (i, start, end), entities in zip(chunks, chunk_entities, strict=True):
+            doc_chunks[i].append((start, end, entities))
+
+        return [self._merge_chunk_entities(spans) for spans in doc_chunks]
+
+    def _merge_chunk_entities(self, spans: list[tuple[int, int, list[Entity]]]) -> list[Entity]:
+        """Combine the entities of a document's overlapping chunks.
+
+        Each chunk keeps the entities starting before the next chunk does,
+        so an entity in an overlap is taken from the chunk that sees it with
+        the most context after it. Entities that still overlap, such as one
+        cut by a chunk boundary and its whole version from the neighbouring
+        chunk, are resolved by keeping the longest span, or the one with the
+        highest confidence among spans of equal length.
+
+        Args:
+            spans: Start, end and entities of each chunk of the document, in order.
+
+        Returns:
+            List[Entity]: Non-overlapping entities sorted by position.
+
+        """
+        candidates: list[Entity] = []
+        for k, (_, end, entities) in enumerate(spans):
+            next_start = spans[k + 1][0] if k + 1 < len(spans) else end
+            for entity in entities:
+                if entity.start_pos >= next_start and k + 1 < len(spans):
+                    continue
+                candidates.append(entity)
+
+        merged: list[Entity] = []
+        for entity in sorted(candidates, key=lambda e: (e.start_pos, e.start_pos - e.end_pos, -e.confidence)):
+            if merged and entity.start_pos < merged[-1].end_pos:
+                kept = merged[-1]
+                if (entity.end_pos - entity.start_pos, entity.confidence) > (kept.end_pos - kept.start_pos, kept.confidence):
+                    merged[-1] = entity
+                continue
+            merged.append(entity)
+
+        return merged
 
-        # Get available labels
-        labels_gliner = list(self.label_mapping.keys())
+    def _plan_batches(self, lengths: list[int]) -> list[list[int]]:
+        """Group chunks into batches of similar length within a padded size budget.
 
-        # Process text in chunks if needed
+        Chunks are sorted by length and packed greedily while the padded size
+        of the batch (its length times its longest chunk) stays within that of
+        CHUNK_BATCH_SIZE full-size chunks, so little of each batch is padding.
+
+        Args:
+            lengths: Length in characters of each chunk.
+
+        Returns:
+            List[List[int]]: Positions in ``lengths`` of each batch.
+
+        """
+        budget = CHUNK_BATCH_SIZE * self.max_chunk_size
+
+        batches = []
+        batch: list[int] = []
+        for j in sorted(range(len(lengths)), key=lengths.__getitem__):
+            # Sorted ascending, so the chunk being added is the longest of the batch
+            if batch and ((len(batch) + 1) * lengths[j] > budget or len(batch) >= MAX_CHUNK_BATCH):
+                batches.append(batch)
+                batch = []
+            batch.append(j)
+        if batch:
+            batches.append(batch)
+
+        return batches
+
+    def _iter_chunks(self, text: str) -> Iterator[tuple[int, int]]:
+        """Split a document into non-blank, overlapping chunks of at most max_chunk_size characters.
+
+        Chunks end at the last whitespace in their second half when there
+        is one, so that words are not cut in two between chunks. Each chunk
+        starts up to CHUNK_OVERLAP characters before the previous one ends,
+        at a word start when the overlap holds whitespace, so entities
+        crossing a boundary appear whole in one of the two chunks.
+
+        Args:
+            text: Document to split.
+
+        Yields:
+            Tuple[int, int]: Start and end offsets of each chunk.
+
+        """
         doc_len = len(text)
+        overlap = min(CHUNK_OVERLAP, self.max_chunk_size // 4)
         offset = 0
-        entities = []
-        error_count = 0
-        max_errors = 5  # Maximum consecutive errors before giving up on document
 
         while offset < doc_len:
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
+            end = min(offset + self.max_chunk_size, doc_len)
+            if end < doc_len:
+                lo = offset + self.max_chunk_size // 2
+                cut = max(text.rfind(" ", lo, end), text.rfind("\n", lo, end))
+                if cut > offset:
+                    end = cut + 1
+
+            if not text[offset:end].isspace():
+                yield offset, end
+            if end >= doc_len:
+                break
+
+            # Chunks end more than max_chunk_size // 2 past their start, so this always advances
+            offset = end - overlap
+            spaces = [pos for pos in (text.find(" ", offset, end - 1), text.find("\n", offset, end - 1)) if pos >= 0]
+            if spaces:
+                offset = min(spaces) + 1
+
+    def _to_entities(self, chunk_ents: list[dict], offset: int) -> list[Entity]:
+        """Convert GLiNER predictions for a chunk to entities in document coordinates.
+
+        Args:
+            chunk_ents: GLiNER entity predictions for the chunk.
+            offset: Position of the chunk in the document.
+
+        Returns:
+            List[Entity]: Entities sorted by start position.
+
+        """
+        if not chunk_ents:
+            return []
+
+        # Sort by start position for stable ordering and shift into document coordinates
+        n = len(chunk_ents)
+        starts = np.fromiter((ent["start"] for ent in chunk_ents), dtype=np.int64, count=n)
+        ends = np.fromiter((ent["end"] for ent in chunk_ents), dtype=np.int64, count=n)
+        order = starts.argsort(kind="stable")
+        starts += offset
+        ends += offset
+
+        label_get = self.label_mapping.get
+        entities = []
+        for i, start, end in zip(order.tolist(), starts[order].tolist(), ends[order].tolist(), strict=True):
+            ent = chunk_ents[i]
+            entities.append(
+                Entity(
+                    text=ent["text"],
+                    labels=[label_get(ent["label"], ent["label"])],
+                    start_pos=start,
+                    end_pos=end,
+                    confidence=float(ent["score"]),
+                )
+            )
+        return entities
+
+    def _extract_with_retry(self, text: str, start: int, end: int) -> list[Entity]:
+        """Extract entities from a span of text one chunk at a time.
+
+        Used when a batched prediction fails: chunks are shrunk after
+        errors, and skipped after repeated failures.
+
+        Args:
+            text: Full document.
+            start: Start of the span to process.
+            end: End of the span to process.
+
+        Returns:
+            List[Entity]: Entities found in the span.
+
+        """
+        offset = start
+        entities = []
+        error_count = 0
+        max_errors = 5  # Maximum consecutive errors before giving up on the span
 
+        while offset < end:
             # Calculate chunk size dynamically if we're having trouble
             chunk_size = self.max_chunk_size
             if error_count > 0:
                 # Reduce chunk size if we're encountering errors
                 chunk_size = max(50, chunk_size // (error_count + 1))
 
-            end = min(offset + chunk_size, doc_len)
-            chunk = text[offset:end]
+            chunk_end = min(offset + chunk_size, end)
+            chunk = text[offset:chunk_end]
 
             # Skip empty chunks
             if not chunk or chunk.isspace():
-                offset = end
+                offset = chunk_end
                 continue
 
             # Try different chunk sizes if we encounter errors
@@ -210,7 +625,7 @@ class GLiNERModel(NERModel):
                 if size <= 0:
                     continue
 
-                retry_end = min(offset + size, doc_len)
+                retry_end = min(offset + size, end)
                 retry_chunk = text[offset:retry_end]
 
                 if not retry_chunk or retry_chunk.isspace():
@@ -219,27 +634,15 @@ class GLiNERModel(NERModel):
                     break
 
                 try:
-                    chunk_ents = self._model.predict_entities(retry_chunk, labels_gliner, threshold=self.threshold)
+                    chunk_ents = self._predict([retry_chunk])[0]
 
                     # Process entities if any
                     if chunk_ents:
-                        # Sort by start position for stable ordering
-                        chunk_ents.sort(key=lambda x: x["start"])
-
-                        # Convert to our format
-                        for ent in chunk_ents:
-                            entities.append(
-                                Entity(
-                                    text=ent["text"],
-                                    labels=[self.label_mapping.get(ent["label"], ent["label"])],
-                                    start_pos=ent["start"] + offset,
-                                    end_pos=ent["end"] + offset,
-                                    confidence=float(ent["score"]),
-                                )
-                            )
+                        chunk_entities = self._to_entities(chunk_ents, offset)
+                        entities.extend(chunk_entities)
 
                         # Avoid splitting entity across chunks by advancing to end of last entity
-                        offset += chunk_ents[-1]["end"]
+                        offset = max(chunk_entities[-1].end_pos, offset + 1)
                     else:
                         # No entities in this chunk, move to next
                         offset = retry_end
@@ -255,8 +658,10 @@ class GLiNERModel(NERModel):
                     continue
 
                 except Exception as e:
-                    # Try smaller chunk for other errors too
+                    # Try smaller chunk for other errors too, releasing cached blocks after an OOM
                     logger.debug(f"GLiNER error with chunk size {size}: {e}")
+                    if "out of memory" in str(e).lower() and torch.cuda.is_available():
+                        torch.cuda.empty_cache()
                     continue
 
             if not success:
@@ -264,7 +669,7 @@ class GLiNERModel(NERModel):
                 logger.warning(f"GLiNER encountered an indexing error on chunk at position {offset}. Skipping chunk.")
                 error_count += 1
                 if error_count >= max_errors:
-                    logger.warning("Too many consecutive errors, skipping the rest of the document")
+                    logger.warning("Too many consecutive errors, skipping the rest of the chunk")
                     break
 
                 # Skip ahead more aggressively
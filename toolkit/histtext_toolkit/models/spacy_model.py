@@ -14,6 +14,9 @@ from .base import Entity, NERModel, Token, TokenizationModel
 
 logger = get_logger(__name__)
 
+# Number of texts spaCy runs through its pipeline components together
+PIPE_BATCH_SIZE = 64
+
 
 class SpacyNERModel(NERModel):
     """spaCy implementation of named entity recognition model.
@@ -23,10 +26,13 @@ class SpacyNERModel(NERModel):
 
     Attributes:
         model_path (str): Path to the spaCy model.
-        exclude (List[str]): Components to exclude when loading the model.
+        exclude (Sequence[str]): Components to exclude when loading the model.
 
     """
 
+    # Pipeline components not needed for NER, shared by all instances
+    DEFAULT_EXCLUDE = ("parser", "tagger", "lemmatizer", "attribute_ruler")
+
     def __init__(self, model_path: str, exclude: list[str] = None):
         """Initialize the spaCy NER model.
 
@@ -38,7 +44,7 @@ class SpacyNERModel(NERModel):
 
         """
         self.model_path = model_path
-        self.exclude = exclude or ["parser", "tagger", "lemmatizer", "attribute_ruler"]
+        self.exclude = exclude or self.DEFAULT_EXCLUDE
         self._model: Optional[Language] = None
 
     def load(self) -> bool:
@@ -88,18 +94,31 @@ class SpacyNERModel(NERModel):
         Returns:
             List[Entity]: List of extracted entities with their positions and labels.
 
+        """
+        return self.extract_entities_batch([text])[0]
+
+    def extract_entities_batch(self, texts: list[str]) -> list[list[Entity]]:
+        """Extract named entities from several texts using spaCy.
+
+        Streams the texts through ``Language.pipe`` so the pipeline
+        components process them in batches rather than one document at a time.
+
+        Args:
+            texts: Input texts to analyze.
+
+        Returns:
+            List[List[Entity]]: Extracted entities of each text.
+
         """
         if not self.is_loaded:
             if not self.load():
-                return []
+                return [[] for _ in texts]
 
-        # Process the text with newlines replaced by spaces for better processing
-        doc = self._model(text.replace("\n", " "))
+        # Process the texts with newlines replaced by spaces for better processing
+        docs = self._model.pipe((text.replace("\n", " ") for text in texts), batch_size=PIPE_BATCH_SIZE)
 
-        # Extract entities
-        entities = []
-        for ent in doc.ents:
-            entities.append(
+        return [
+            [
                 Entity(
                     text=ent.text,
                     labels=[ent.label_],
@@ -107,9 +126,10 @@ class SpacyNERModel(NERModel):
                     end_pos=ent.end_char,
                     confidence=-1.0,  # spaCy doesn't provide confidence scores
                 )
-            )
-
-        return entities
+                for ent in doc.ents
+            ]
+            for doc in docs
+        ]
 
 
 class SpacyTokenizationModel(TokenizationModel):
@@ -120,10 +140,13 @@ class SpacyTokenizationModel(TokenizationModel):
 
     Attributes:
         model_path (str): Path to the spaCy model.
-        exclude (List[str]): Components to exclude when loading the model.
+        exclude (Sequence[str]): Components to exclude when loading the model.
 
     """
 
+    # Pipeline components not needed for tokenization, shared by all instances
+    DEFAULT_EXCLUDE = ("ner", "parser", "tagger", "lemmatizer", "attribute_ruler")
+
     def __init__(self, model_path: str, exclude: list[str] = None):
         """Initialize the spaCy tokenization model.
 
@@ -135,13 +158,7 @@ class SpacyTokenizationModel(TokenizationModel):
 
         """
         self.model_path = model_path
-        self.exclude = exclude or [
-            "ner",
-            "parser",
-            "tagger",
-            "lemmatizer",
-            "attribute_ruler",
-        ]
+        self.exclude = exclude or self.DEFAULT_EXCLUDE
         self._model: Optional[Language] = None
 
     def load(self) -> bool:
@@ -4,8 +4,12 @@ This module provides Hugging Face Transformers-based implementations
 of the NER and tokenization models with GPU acceleration support.
 """
 
+import contextlib
+import gc
+import os
+import threading
 from collections.abc import Iterator
-from typing import Optional
+from typing import Any, Optional
 
 import numpy as np
 import torch
@@ -18,10 +22,34 @@ from transformers import (
 )
 
 from ..core.logging import get_logger
-from .base import AggregationStrategy, Entity, NERModel, Token, TokenizationModel
+from .base import AggregationStrategy, Entity, NERModel, Token, TokenizationModel, configure_cuda_allocator
 
 logger = get_logger(__name__)
 
+# Reserved CUDA memory below which empty_cache() is not worth the device sync
+GPU_CACHE_RELEASE_THRESHOLD = 1 << 28  # 256 MB
+
+# Number of texts the NER pipeline runs through the model together
+PIPELINE_BATCH_SIZE = 16
+
+# Try to import ONNX Runtime support without failing if unavailable
+try:
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForTokenClassification
+
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+# Try to import bitsandbytes (int8 GPU weights) without failing if unavailable
+try:
+    import bitsandbytes  # noqa: F401
+    from transformers import BitsAndBytesConfig
+
+    BNB_AVAILABLE = True
+except ImportError:
+    BNB_AVAILABLE = False
+
 
 class TransformersNERModel(NERModel):
     """Hugging Face Transformers implementation of named entity recognition model.
@@ -35,16 +63,30 @@ class TransformersNERModel(NERModel):
         max_length (Optional[int]): Maximum sequence length for tokenization.
         stride (int): Stride for sliding window processing of long sequences.
         aggregation_strategy (AggregationStrategy): Strategy for aggregating subword tokens.
+        use_onnx (bool): Whether to run CPU inference through ONNX Runtime.
+        use_int8 (bool): Whether to run the model with int8 weights.
+        use_compile (bool): Whether the model is compiled with torch.compile on GPU.
+        dtype (str): Precision of the forward pass on GPU.
         _device (str): Device to run the model on ('cuda:0' or 'cpu').
 
     """
 
+    # Loaded (model, tokenizer) pairs shared between wrappers, keyed by _cache_key(); the
+    # lock is held while a model is loaded, so concurrent loads of one key load it once
+    _MODEL_CACHE: dict[tuple, tuple[Any, PreTrainedTokenizer | None]] = {}
+    _MODEL_REFCOUNT: dict[tuple, int] = {}
+    _MODEL_CACHE_LOCK = threading.Lock()
+
     def __init__(
         self,
         model_path: str,
         max_length: Optional[int] = None,
         stride: int = 10,
         aggregation_strategy: str = "FIRST",
+        use_onnx: bool = False,
+        use_int8: bool = False,
+        use_compile: bool = False,
+        dtype: str = "float32",
     ):
         """Initialize the Transformers NER model.
 
@@ -54,59 +96,233 @@ class TransformersNERModel(NERModel):
             stride: Stride for sliding window when processing long sequences.
             aggregation_strategy: Strategy for aggregating subwords. Options are:
                 "NONE", "SIMPLE", "FIRST", "AVERAGE", or "MAX".
+            use_onnx: Export the model to ONNX and run it with ONNX Runtime when
+                running on CPU. Requires `optimum[onnxruntime]`.
+            use_int8: Quantize the Linear layers to int8: dynamically on CPU, and
+                with bitsandbytes weight-only quantization on GPU.
+            use_compile: Compile the model with torch.compile on GPU. Cuts per-batch
+                launch overhead on short texts, but loading takes longer.
+            dtype: Precision of the forward pass on GPU: 'float32', 'float16' or
+                'bfloat16' (falls back to float16 on GPUs without bfloat16 support).
+                Weights stay in float32; matmuls are autocast to the reduced precision.
+                Defaults to float32; reduced precision can shift entity scores.
 
         """
         self.model_path = model_path
         self.max_length = max_length
         self.stride = stride
         self.aggregation_strategy = AggregationStrategy[aggregation_strategy]
-        self._model: Optional[PreTrainedModel] = None
-        self._tokenizer: Optional[PreTrainedTokenizer] = None
+        self.use_onnx = use_onnx
+        self.use_int8 = use_int8
+        self.use_compile = use_compile
+        self.dtype = dtype
+        self._autocast_dtype: torch.dtype | None = None
+        # A PreTrainedModel, or an ONNX Runtime model with the same call interface
+        self._model: Any = None
+        self._tokenizer: Any = None
+        self._pipeline: Any = None
         self._device = "cuda:0" if torch.cuda.is_available() else "cpu"
 
     def load(self) -> bool:
         """Load the Transformers model and tokenizer.
 
+        Instances with the same model path, device and loading options share
+        one loaded model and tokenizer.
+
         Returns:
             bool: True if model loaded successfully, False otherwise.
 
         """
+        if self._model is not None:
+            return True
+
+        configure_cuda_allocator()
+        self._autocast_dtype = self._resolve_autocast_dtype()
+
+        key = self._cache_key()
+        with TransformersNERModel._MODEL_CACHE_LOCK:
+            if key in TransformersNERModel._MODEL_CACHE:
+                self._model, self._tokenizer = TransformersNERModel._MODEL_CACHE[key]
+                TransformersNERModel._MODEL_REFCOUNT[key] += 1
+                logger.info(f"Reusing loaded Transformers model {self.model_path} on {self._device}")
+                return True
+
+            try:
+                # Load tokenizer with optional max length
+                tokenizer_kwargs = {}
+                if self.max_length is not None:
+                    tokenizer_kwargs["model_max_length"] = self.max_length
+
+                self._tokenizer = AutoTokenizer.from_pretrained(self.model_path, **tokenizer_kwargs)
+
+                # Use ONNX Runtime for CPU inference if requested
+                if self.use_onnx and self._device == "cpu":
+                    self._model = self._load_onnx_model()
+
+                if self._model is not None:
+                    logger.info(f"Loaded Transformers model from {self.model_path} with ONNX Runtime")
+                else:
+                    # Load model and move to appropriate device
+                    self._model = self._load_int8_gpu_model() if self.use_int8 and self._device != "cpu" else None
+                    if self._model is None:
+                        self._model = AutoModelForTokenClassification.from_pretrained(self.model_path)
+                        self._model.to(self._device)
+                    self._model.eval()
+
+                    # Inference only: drop autograd bookkeeping on the weights
+                    for param in self._model.parameters():
+                        param.requires_grad_(False)
+
+                    # Quantize Linear layers to int8 on CPU, keeping fp32 weights if it fails
+                    if self.use_int8 and self._device == "cpu":
+                        try:
+                            self._model = torch.quantization.quantize_dynamic(self._model, {torch.nn.Linear}, dtype=torch.qint8)
+                            logger.info("Applied int8 dynamic quantization")
+                        except Exception as e:
+                            logger.warning(f"Int8 quantization failed, keeping fp32 model: {e}")
+
+                    if self.use_compile:
+                        self._compile()
+
+                    logger.info(f"Loaded Transformers model from {self.model_path} on {self._device}")
+
+                TransformersNERModel._MODEL_CACHE[key] = (self._model, self._tokenizer)
+                TransformersNERModel._MODEL_REFCOUNT[key] = 1
+                return True
+            except Exception as e:
+                logger.error(f"Failed to load Transformers model: {e}")
+                self._model = None
+                self._tokenizer = None
+                return False
+
+    def _cache_key(self) -> tuple:
+        """Get the key under which this instance's loaded model is shared.
+
+        Returns:
+            tuple: The model path, device and the options that change the loaded weights.
+
+        """
+        return (self.model_path, self._device, self.max_length, self.use_onnx, self.use_int8, self.use_compile)
+
+    def _resolve_autocast_dtype(self) -> torch.dtype | None:
+        """Get the reduced precision dtype to autocast GPU forward passes to, if any.
+
+        Returns:
+            Optional[torch.dtype]: float16 or bfloat16, or None to run in float32.
+
+        """
+        # bitsandbytes int8 layers already pick their own compute dtype
+        if not self._device.startswith("cuda") or self.use_int8 or self.dtype == "float32":
+            return None
+        if self.dtype == "bfloat16" and torch.cuda.is_bf16_supported():
+            return torch.bfloat16
+        if self.dtype not in ("float16", "bfloat16"):
+            logger.warning(f"Unknown Transformers dtype '{self.dtype}', using float16")
+        return torch.float16
+
+    def _compile(self) -> None:
+        """Compile the model's forward pass with CUDA graphs to cut per-call launch overhead."""
+        if self._model is None or not self._device.startswith("cuda") or self.use_int8 or not hasattr(torch, "compile"):
+            return
+
+        # Compile the bound forward rather than the module, so the pipeline still sees a PreTrainedModel
         try:
-            # Load tokenizer with optional max length
-            tokenizer_kwargs = {}
-            if self.max_length is not None:
-                tokenizer_kwargs["model_max_length"] = self.max_length
+            self._model.forward = torch.compile(self._model.forward, mode="reduce-overhead", dynamic=True)
+        except Exception as e:
+            logger.warning(f"Could not compile Transformers model, running it eagerly: {e}")
+            return
 
-            self._tokenizer = AutoTokenizer.from_pretrained(self.model_path, **tokenizer_kwargs)
+        # Compile during load rather than on the first documents, for a short and a full batch
+        try:
+            for batch_size in (1, PIPELINE_BATCH_SIZE):
+                self.extract_entities_batch(["warm up " * 32] * batch_size)
+            logger.info("Compiled Transformers model with torch.compile")
+        except Exception as e:
+            logger.warning(f"Transformers compilation warm-up failed: {e}")
 
-            # Load model and move to appropriate device
-            self._model = AutoModelForTokenClassification.from_pretrained(self.model_path)
-            self._model.to(self._device)
-            self._model.eval()
+    def _load_int8_gpu_model(self) -> PreTrainedModel | None:
+        """Load the model on the GPU with int8 weights through bitsandbytes.
 
-            logger.info(f"Loaded Transformers model from {self.model_path} on {self._device}")
-            return True
+        Halves the weight memory and bandwidth of the forward pass; outlier
+        activations above the threshold are kept in float16.
+
+        Returns:
+            Optional[PreTrainedModel]: The quantized model, or None if bitsandbytes is unavailable or loading failed.
+
+        """
+        if not BNB_AVAILABLE:
+            logger.warning("bitsandbytes not available, loading fp32 weights. Install with `pip install bitsandbytes`")
+            return None
+
+        try:
+            model: PreTrainedModel = AutoModelForTokenClassification.from_pretrained(
+                self.model_path,
+                quantization_config=BitsAndBytesConfig(load_in_8bit=True, llm_int8_threshold=6.0),
+                device_map={"": self._device},
+            )
+            logger.info("Loaded int8 weights with bitsandbytes")
+            return model
         except Exception as e:
-            logger.error(f"Failed to load Transformers model: {e}")
-            return False
+            logger.warning(f"Int8 GPU loading failed, loading fp32 weights: {e}")
+            return None
+
+    def _load_onnx_model(self) -> Any:
+        """Export the model to ONNX and open it with the CPU execution provider.
+
+        Returns:
+            The ONNX Runtime model, or None if ONNX Runtime is unavailable or the export failed.
+
+        """
+        if not ONNX_AVAILABLE:
+            logger.warning("ONNX Runtime not available. Install with `pip install optimum[onnxruntime]`")
+            return None
+
+        try:
+            session_options = onnxruntime.SessionOptions()
+            session_options.intra_op_num_threads = os.cpu_count() or 1
+
+            return ORTModelForTokenClassification.from_pretrained(
+                self.model_path,
+                export=True,
+                provider="CPUExecutionProvider",
+                session_options=session_options,
+            )
+        except Exception as e:
+            logger.warning(f"ONNX export failed, falling back to PyTorch: {e}")
+            return None
 
     def unload(self) -> bool:
         """Unload the Transformers model and tokenizer from memory.
 
+        The shared model is freed, and the GPU cache released, only when the
+        last instance using it is unloaded.
+
         Returns:
             bool: True if successful, False otherwise.
 
         """
-        if hasattr(self, "_model") and self._model is not None:
-            del self._model
-        if hasattr(self, "_tokenizer") and self._tokenizer is not None:
-            del self._tokenizer
+        was_loaded = self._model is not None
 
         self._model = None
         self._tokenizer = None
+        self._pipeline = None
 
-        # Force GPU memory cleanup if available
-        if torch.cuda.is_available():
+        if not was_loaded:
+            return True
+
+        key = self._cache_key()
+        with TransformersNERModel._MODEL_CACHE_LOCK:
+            refcount = TransformersNERModel._MODEL_REFCOUNT.get(key, 1) - 1
+            if refcount > 0:
+                TransformersNERModel._MODEL_REFCOUNT[key] = refcount
+                return True
+
+            TransformersNERModel._MODEL_CACHE.pop(key, None)
+            TransformersNERModel._MODEL_REFCOUNT.pop(key, None)
+
+        # Release cached GPU blocks only if this model actually held some
+        if self._device.startswith("cuda") and torch.cuda.memory_reserved() > GPU_CACHE_RELEASE_THRESHOLD:
+            gc.collect()
             torch.cuda.empty_cache()
 
         return True
@@ -149,7 +365,7 @@ class TransformersNERModel(NERModel):
         num_spans = len(model_inputs["input_ids"])
 
         for span_idx in range(num_spans):
-            span_model_inputs = {}
+            span_model_inputs: dict[str, Any] = {}
             for k, v in model_inputs.items():
                 span_v = v[span_idx]
                 if k in self._tokenizer.model_input_names:
@@ -178,36 +394,81 @@ class TransformersNERModel(NERModel):
             List[Entity]: List of extracted entities with their positions and labels.
 
         """
-        if not self.is_loaded:
-            if not self.load():
-                return []
+        return self.extract_entities_batch([text])[0]
 
-        # Using the pipeline approach for simplicity and robustness
-        pipe = pipeline(
-            "ner",
-            model=self._model,
-            tokenizer=self._tokenizer,
-            aggregation_strategy=self.aggregation_strategy.name.lower(),
-            device=0 if torch.cuda.is_available() else -1,
-        )
+    def extract_entities_batch(self, texts: list[str]) -> list[list[Entity]]:
+        """Extract named entities from several texts using Transformers.
 
-        # Process the text with newlines replaced for better processing
-        ner_output = pipe(text.replace("\n", " "))
+        The texts go through the pipeline in padded batches of
+        PIPELINE_BATCH_SIZE instead of one forward pass each, sorted by
+        length so little of each batch is padding.
 
-        # Convert to our Entity format
-        entities = []
-        for ent in ner_output:
-            entities.append(
+        Args:
+            texts: Input texts to analyze.
+
+        Returns:
+            List[List[Entity]]: Extracted entities of each text, empty for blank texts.
+
+        """
+        if not self.is_loaded:
+            if not self.load():
+                return [[] for _ in texts]
+
+        results: list[list[Entity]] = [[] for _ in texts]
+        indices = [i for i, text in enumerate(texts) if text and not text.isspace()]
+        if not indices:
+            return results
+
+        # Feed texts by length so each padded batch holds texts of similar size
+        indices.sort(key=lambda i: len(texts[i]))
+
+        # Process the texts with newlines replaced for better processing
+        autocast = torch.autocast("cuda", dtype=self._autocast_dtype) if self._autocast_dtype is not None else contextlib.nullcontext()
+        with torch.inference_mode(), autocast:
+            outputs = self._get_pipeline()([texts[i].replace("\n", " ") for i in indices], batch_size=PIPELINE_BATCH_SIZE)
+
+        # Convert to our Entity format, taking the entity text from the source offsets:
+        # the pipeline's "word" is rebuilt from subword tokens and may not match it
+        for i, ner_output in zip(indices, outputs, strict=True):
+            text = texts[i]
+            results[i] = [
                 Entity(
-                    text=ent["word"],
+                    text=text[ent["start"] : ent["end"]] if ent.get("start") is not None else ent["word"],
                     labels=[ent["entity_group"]],
                     start_pos=ent["start"],
                     end_pos=ent["end"],
                     confidence=float(ent["score"]),
                 )
-            )
+                for ent in ner_output
+            ]
 
-        return entities
+        return results
+
+    def _get_pipeline(self) -> Any:
+        """Get the NER pipeline, creating it on first use.
+
+        Returns:
+            The Hugging Face token classification pipeline.
+
+        """
+        if self._pipeline is None:
+            # Texts longer than the model are tokenized once into overlapping token windows,
+            # whose offsets map back to the text; this needs a fast tokenizer and aggregation
+            pipeline_kwargs: dict[str, Any] = {}
+            if self.aggregation_strategy != AggregationStrategy.NONE and getattr(self._tokenizer, "is_fast", False):
+                pipeline_kwargs["stride"] = self.stride
+
+            # Using the pipeline approach for simplicity and robustness
+            self._pipeline = pipeline(
+                "token-classification",
+                model=self._model,
+                tokenizer=self._tokenizer,
+                aggregation_strategy=self.aggregation_strategy.name.lower(),
+                # Models placed with a device map (int8 weights) must not be moved by the pipeline
+                device=None if getattr(self._model, "hf_device_map", None) else (0 if torch.cuda.is_available() else -1),
+                **pipeline_kwargs,
+            )
+        return self._pipeline
 
 
 class TransformersTokenizationModel(TokenizationModel):
@@ -249,6 +510,8 @@ class TransformersTokenizationModel(TokenizationModel):
             bool: True if model loaded successfully, False otherwise.
 
         """
+        configure_cuda_allocator()
+
         try:
             # Load tokenizer with optional max length
             tokenizer_kwargs = {}
@@ -275,6 +538,8 @@ class TransformersTokenizationModel(TokenizationModel):
             bool: True if successful, False otherwise.
 
         """
+        was_on_gpu = self._model is not None and self._device.startswith("cuda")
+
         if hasattr(self, "_model") and self._model is not None:
             del self._model
         if hasattr(self, "_tokenizer") and self._tokenizer is not None:
@@ -283,8 +548,9 @@ class TransformersTokenizationModel(TokenizationModel):
         self._model = None
         self._tokenizer = None
 
-        # Force GPU memory cleanup if available
-        if torch.cuda.is_available():
+        # Release cached GPU blocks only if this model actually held some
+        if was_on_gpu and torch.cuda.memory_reserved() > GPU_CACHE_RELEASE_THRESHOLD:
+            gc.collect()
             torch.cuda.empty_cache()
 
         return True
@@ -324,26 +590,16 @@ class TransformersTokenizationModel(TokenizationModel):
             add_special_tokens=False,
         )
 
-        tokens = []
-        for i, (start, end) in enumerate(encoded.offset_mapping):
-            # Skip special tokens (like [CLS], [SEP], etc.)
-            if encoded.special_tokens_mask[i]:
-                continue
-
-            # Skip empty spans
-            if start == end:
-                continue
-
-            # Get the token text
-            token_text = text[start:end]
-
-            tokens.append(
-                Token(
-                    text=token_text,
-                    start_pos=start,
-                    end_pos=end,
-                    confidence=1.0,  # Transformer tokenizers don't provide confidence scores
-                )
-            )
+        # Select real, non-empty spans (no special tokens like [CLS], [SEP]) in one pass
+        offsets = np.asarray(encoded.offset_mapping, dtype=np.int64).reshape(-1, 2)
+        keep = (offsets[:, 1] > offsets[:, 0]) & ~np.asarray(encoded.special_tokens_mask, dtype=bool)
 
-        return tokens
+        return [
+            Token(
+                text=text[start:end],
+                start_pos=start,
+                end_pos=end,
+                confidence=1.0,  # Transformer tokenizers don't provide confidence scores
+            )
+            for start, end in offsets[keep].tolist()
+        ]
@@ -149,14 +149,16 @@ class EmbeddingsProcessor:
         doc_ids = list(documents.keys())
         texts = list(documents.values())
 
-        # Filter out empty texts
+        # Filter out empty texts, measuring the valid ones in the same pass
         valid_indices = []
         valid_texts = []
+        total_length = 0
 
         for i, text in enumerate(texts):
             if text and not text.isspace():
                 valid_indices.append(i)
                 valid_texts.append(text)
+                total_length += len(text)
             else:
                 # Add zero vector for empty texts
                 dim = self.model.get_dimension()
@@ -168,7 +170,8 @@ class EmbeddingsProcessor:
             available_memory = memory_info.get("gpu_available_gb") if memory_info.get("gpu_available_gb") else memory_info.get("ram_available_gb")
 
             # Adjust batch size based on available memory and error rate
-            adaptive_batch_size = self._determine_batch_size(valid_texts, available_memory)
+            avg_length = total_length / len(valid_texts) if valid_texts else None
+            adaptive_batch_size = self._determine_batch_size(avg_length, available_memory)
 
             logger.debug(f"Using adaptive batch size: {adaptive_batch_size}")
         except Exception as e:
@@ -272,23 +275,20 @@ class EmbeddingsProcessor:
 
         return results
 
-    def _determine_batch_size(self, texts: list[str], available_memory_gb: Optional[float] = None) -> int:
+    def _determine_batch_size(self, avg_length: float | None, available_memory_gb: float | None = None) -> int:
         """Determine optimal batch size based on text lengths and available memory.
 
         Args:
-            texts: List of texts to embed
+            avg_length: Average length in characters of the texts to embed, None if there are none
             available_memory_gb: Available memory in GB
 
         Returns:
             int: Optimal batch size
 
         """
-        if not texts:
+        if avg_length is None:
             return 16  # Default batch size for empty list
 
-        # Compute average text length
-        avg_length = sum(len(text) for text in texts) / len(texts)
-
         # Default batch sizes based on text length
         if avg_length > 10000:
             batch_size = 4  # Very long texts
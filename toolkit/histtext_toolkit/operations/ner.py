@@ -4,7 +4,11 @@ This module provides functionality for Named Entity Recognition operations,
 including precomputing and caching annotations.
 """
 
+import dataclasses
+import hashlib
 import os
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
 from typing import Any, Optional
 
 from ..cache.manager import get_cache_manager
@@ -16,6 +20,13 @@ from ..solr.client import SolrClient
 
 logger = get_logger(__name__)
 
+# Number of documents passed to the model together by process_documents
+DOCUMENT_BATCH_SIZE = 32
+
+# Number of distinct texts whose entities are kept in memory, so repeated
+# texts (titles, boilerplate) skip the model
+ENTITY_CACHE_SIZE = 4096
+
 
 def split_long_document(doc: str, max_length: int = 30_000) -> list[str]:
     """Split a long document into smaller chunks.
@@ -48,6 +59,22 @@ def split_long_document(doc: str, max_length: int = 30_000) -> list[str]:
     return doc_splits
 
 
+def _copy_entities(entities: list[Entity]) -> list[Entity]:
+    """Copy a list of entities, labels included.
+
+    Cached entities are handed out as copies, so callers can modify what
+    they get without changing the cache or the results of other texts.
+
+    Args:
+        entities: Entities to copy
+
+    Returns:
+        List[Entity]: Independent copies of the entities
+
+    """
+    return [dataclasses.replace(entity, labels=list(entity.labels)) for entity in entities]
+
+
 class NERProcessor:
     """Processor for Named Entity Recognition operations.
 
@@ -65,6 +92,7 @@ class NERProcessor:
         """
         self.model = model
         self.cache_root = cache_root
+        self._entity_cache: OrderedDict[bytes, list[Entity]] = OrderedDict()
 
     def extract_entities(self, text: str) -> list[Entity]:
         """Extract entities from text.
@@ -88,7 +116,8 @@ class NERProcessor:
             entities = []
             splits = split_long_document(text)
 
-            offset = 0
+            # Every split starts with the newline before it, the first one included
+            offset = -1
             for split in splits:
                 split_entities = self.model.extract_entities(split)
 
@@ -104,6 +133,107 @@ class NERProcessor:
         else:
             return self.model.extract_entities(text)
 
+    def extract_entities_batch(self, texts: list[str]) -> list[list[Entity]]:
+        """Extract entities from several texts.
+
+        Texts short enough to need no splitting are passed to the model
+        together, so models that batch can process them in shared forward
+        passes; long documents are split and processed one by one. Repeated
+        short texts are extracted once and served from an in-memory cache.
+
+        Args:
+            texts: Input texts
+
+        Returns:
+            List[List[Entity]]: Extracted entities of each text
+
+        """
+        results: list[list[Entity]] = [[] for _ in texts]
+
+        # Texts are keyed by digest to keep long keys out of the cache
+        pending: dict[bytes, tuple[str, list[int]]] = {}
+        for i, text in enumerate(texts):
+            if not text or len(text) > 30_000:
+                continue
+            key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+            cached = self._entity_cache.get(key)
+            if cached is not None:
+                self._entity_cache.move_to_end(key)
+                results[i] = _copy_entities(cached)
+            elif key in pending:
+                pending[key][1].append(i)
+            else:
+                pending[key] = (text, [i])
+
+        if pending:
+            batch_entities = self.model.extract_entities_batch([text for text, _ in pending.values()])
+            for (key, (_, indices)), entities in zip(pending.items(), batch_entities, strict=True):
+                self._entity_cache[key] = entities
+                if len(self._entity_cache) > ENTITY_CACHE_SIZE:
+                    self._entity_cache.popitem(last=False)
+                for i in indices:
+                    results[i] = _copy_entities(entities)
+
+        for i, text in enumerate(texts):
+            if text and len(text) > 30_000:
+                results[i] = self.extract_entities(text)
+
+        return results
+
+    def _iter_documents(self, documents: dict[str, str], desc: str) -> Iterator[tuple[str, list[Entity]]]:
+        """Extract entities from non-empty documents, in batches.
+
+        Results are yielded batch by batch, so callers can convert and drop
+        each batch's entities before the next one is extracted. A batch that
+        fails is processed again document by document, so one bad document
+        only loses its own entities.
+
+        Args:
+            documents: Dictionary mapping document IDs to text
+            desc: Progress bar description
+
+        Yields:
+            Tuple[str, List[Entity]]: Document ID and its entities
+
+        """
+        from tqdm import tqdm
+
+        error_count = 0
+
+        items = []
+        for doc_id, text in documents.items():
+            if not text or text.isspace():
+                # Skip empty documents
+                logger.debug(f"Skipping empty document: {doc_id}")
+            else:
+                items.append((doc_id, text))
+
+        with tqdm(total=len(items), desc=desc, leave=False) as progress:
+            for start in range(0, len(items), DOCUMENT_BATCH_SIZE):
+                batch = items[start : start + DOCUMENT_BATCH_SIZE]
+                batch_entities: Sequence[list[Entity] | None]
+                try:
+                    batch_entities = self.extract_entities_batch([text for _, text in batch])
+                except Exception as e:
+                    logger.debug(f"Batch entity extraction failed, processing documents one by one: {e}")
+                    fallback_entities: list[list[Entity] | None] = []
+                    for doc_id, text in batch:
+                        try:
+                            fallback_entities.append(self.extract_entities(text))
+                        except Exception as e:
+                            logger.error(f"Error processing document {doc_id}: {e}")
+                            error_count += 1
+                            fallback_entities.append(None)
+                    batch_entities = fallback_entities
+
+                for (doc_id, _), entities in zip(batch, batch_entities, strict=True):
+                    if entities is not None:
+                        yield doc_id, entities
+                progress.update(len(batch))
+
+        if error_count:
+            logger.warning(f"Encountered errors in {error_count} documents")
+
     def process_documents(self, documents: dict[str, str]) -> dict[str, list[dict[str, Any]]]:
         """Process a batch of documents.
 
@@ -118,36 +248,19 @@ class NERProcessor:
 
         """
         results = {}
-        errors = {}
-
-        from tqdm import tqdm
-
-        for doc_id, text in tqdm(documents.items(), desc="Extracting entities", leave=False):
-            try:
-                if not text or text.isspace():
-                    # Skip empty documents
-                    logger.debug(f"Skipping empty document: {doc_id}")
-                    continue
-
-                entities = self.extract_entities(text)
-
-                if entities:  # Only include documents with entities
-                    results[doc_id] = [
-                        {
-                            "text": entity.text,
-                            "labels": entity.labels,
-                            "start_pos": entity.start_pos,
-                            "end_pos": entity.end_pos,
-                            "confidence": entity.confidence,
-                        }
-                        for entity in entities
-                    ]
-            except Exception as e:
-                logger.error(f"Error processing document {doc_id}: {e}")
-                errors[doc_id] = str(e)
 
-        if errors:
-            logger.warning(f"Encountered errors in {len(errors)} documents")
+        for doc_id, entities in self._iter_documents(documents, "Extracting entities"):
+            if entities:  # Only include documents with entities
+                results[doc_id] = [
+                    {
+                        "text": entity.text,
+                        "labels": entity.labels,
+                        "start_pos": entity.start_pos,
+                        "end_pos": entity.end_pos,
+                        "confidence": entity.confidence,
+                    }
+                    for entity in entities
+                ]
 
         return results
 
@@ -163,13 +276,8 @@ class NERProcessor:
             Dict[str, List[Dict[str, Any]]]: Dictionary mapping document IDs to entities in short format
 
         """
-        results = {}
-
-        for doc_id, text in documents.items():
-            entities = self.extract_entities(text)
-            results[doc_id] = self.model.short_format(entities)
-
-        return results
+        batch_entities = self.extract_entities_batch(list(documents.values()))
+        return {doc_id: self.model.short_format(entities) for doc_id, entities in zip(documents, batch_entities, strict=True)}
 
     async def process_and_cache(
         self,
@@ -1083,13 +1083,14 @@ async def cache_tokenization(
                             f"seconds per document)"
                         )
 
-                    # Force garbage collection to free memory
+                    # Force garbage collection to free memory. Cached CUDA blocks are left
+                    # for the next batch: emptying the cache after every batch only adds a
+                    # device sync and fresh cudaMalloc calls
                     gc.collect()
                     try:
                         import torch
 
                         if torch.cuda.is_available():
-                            torch.cuda.empty_cache()
                             # Log memory usage
                             device = torch.cuda.current_device()
                             reserved = torch.cuda.memory_reserved(device) / 1024**3
@@ -8,7 +8,7 @@ setup(
     author="Baptiste Blouin",
     author_email="histtext@gmail.com",
     packages=find_packages(),
-    python_requires=">=3.8",  # Specify Python version requirements
+    python_requires=">=3.10",  # X | None annotations, zip(strict=...) and dataclass(slots=True)
     install_requires=[
         "aiohttp>=3.8.0",
         "jsonlines>=2.0.0",
@@ -19,12 +19,15 @@ setup(
     extras_require={
         "spacy": ["spacy>=3.0.0"],
         "transformers": ["transformers>=4.10.0", "torch>=1.9.0"],
+        "onnx": ["optimum[onnxruntime]>=1.12.0"],
+        "int8": ["bitsandbytes>=0.39.0", "accelerate>=0.20.0"],
         "gliner": ["gliner>=0.1.0"],
         "chinese": [
             "hanziconv>=0.3.2"
         ],
         "fasttext": ["fasttext>=0.9.2"],
         "word2vec": ["gensim>=4.0.0"],
+        "numba": ["numba>=0.57.0"],
         "sentence_transformers": ["sentence-transformers>=2.0.0"],
         "word_embeddings": ["gensim>=4.0.0", "nltk>=3.6.0", "psutil>=5.8.0"],
         "embeddings": [
@@ -0,0 +1,132 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("torch")
+
+from histtext_toolkit.models import gliner_model  # noqa: E402
+from histtext_toolkit.models.base import Entity  # noqa: E402
+from histtext_toolkit.models.gliner_model import GLiNERModel  # noqa: E402
+
+
+class FakeGLiNER:
+    """Stands in for a loaded GLiNER model."""
+
+    tokenizer = None
+
+    def to(self, device):
+        return self
+
+    def eval(self):
+        return self
+
+    def parameters(self):
+        return []
+
+
+@pytest.fixture
+def gliner(monkeypatch):
+    monkeypatch.setattr(gliner_model, "GLINER_AVAILABLE", True)
+    monkeypatch.setattr(GLiNERModel, "_MODEL_CACHE", {})
+    monkeypatch.setattr(GLiNERModel, "_MODEL_REFCOUNT", {})
+    loads = []
+
+    def from_pretrained(self):
+        loads.append(self.model_path)
+        # Widen the window in which concurrent loads of the same key could race
+        time.sleep(0.05)
+        return FakeGLiNER()
+
+    monkeypatch.setattr(GLiNERModel, "_from_pretrained", from_pretrained)
+    return loads
+
+
+def test_concurrent_loads_share_one_model(gliner):
+    models = [GLiNERModel("fake/gliner", use_gpu=False) for _ in range(8)]
+    barrier = threading.Barrier(len(models))
+
+    def load(model):
+        barrier.wait()
+        assert model.load()
+
+    threads = [threading.Thread(target=load, args=(model,)) for model in models]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert gliner == ["fake/gliner"]
+    assert len({id(model._model) for model in models}) == 1
+    key = models[0]._cache_key()
+    assert GLiNERModel._MODEL_REFCOUNT[key] == len(models)
+
+    releases = [threading.Thread(target=model.release_shared) for model in models]
+    for thread in releases:
+        thread.start()
+    for thread in releases:
+        thread.join(timeout=5)
+
+    assert GLiNERModel._MODEL_CACHE == {}
+    assert GLiNERModel._MODEL_REFCOUNT == {}
+
+
+def test_failed_load_leaves_nothing_shared(gliner, monkeypatch):
+    def failing_from_pretrained(self):
+        raise OSError("no such model")
+
+    monkeypatch.setattr(GLiNERModel, "_from_pretrained", failing_from_pretrained)
+    model = GLiNERModel("fake/missing", use_gpu=False)
+
+    assert not model.load()
+    assert not model.is_loaded
+    assert GLiNERModel._MODEL_CACHE == {}
+
+
+def person(start, end, confidence=0.9):
+    return Entity("x" * (end - start), ["P"], start, end, confidence)
+
+
+def test_merge_keeps_the_longest_of_overlapping_spans(gliner):
+    model = GLiNERModel("fake/gliner", use_gpu=False)
+    # Each chunk finds a different span around its shared boundary; the longer one wins either way
+    spans = [
+        (0, 100, [person(10, 20), person(55, 65, 0.95), person(90, 110)]),
+        (60, 160, [person(62, 75, 0.8), person(92, 98, 0.99), person(120, 130)]),
+    ]
+
+    merged = model._merge_chunk_entities(spans)
+
+    assert [(e.start_pos, e.end_pos) for e in merged] == [(10, 20), (62, 75), (92, 98), (120, 130)]
+
+    spans = [
+        (0, 100, [person(50, 66)]),
+        (60, 160, [person(62, 70, 0.99)]),
+    ]
+
+    assert [(e.start_pos, e.end_pos) for e in model._merge_chunk_entities(spans)] == [(50, 66)]
+
+
+def test_merge_prefers_confidence_among_spans_of_equal_length(gliner):
+    model = GLiNERModel("fake/gliner", use_gpu=False)
+    spans = [
+        (0, 100, [person(55, 64, 0.6)]),
+        (60, 160, [person(61, 70, 0.95), person(95, 104, 0.7)]),
+    ]
+
+    merged = model._merge_chunk_entities(spans)
+
+    assert [(e.start_pos, e.end_pos, e.confidence) for e in merged] == [(61, 70, 0.95), (95, 104, 0.7)]
+
+
+def test_merge_leaves_overlap_entities_to_the_next_chunk(gliner):
+    model = GLiNERModel("fake/gliner", use_gpu=False)
+    # An entity starting inside the next chunk is taken from that chunk, which sees more context after it
+    spans = [
+        (0, 100, [person(70, 80, 0.99)]),
+        (60, 160, [person(70, 76, 0.5)]),
+    ]
+
+    merged = model._merge_chunk_entities(spans)
+
+    assert [(e.start_pos, e.end_pos, e.confidence) for e in merged] == [(70, 76, 0.5)]
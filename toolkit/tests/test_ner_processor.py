@@ -0,0 +1,154 @@
+import re
+
+import pytest
+
+pytest.importorskip("spacy")
+pytest.importorskip("transformers")
+
+from histtext_toolkit.models.base import Entity, NERModel  # noqa: E402
+from histtext_toolkit.operations import ner  # noqa: E402
+from histtext_toolkit.operations.ner import NERProcessor  # noqa: E402
+
+
+class StubNERModel(NERModel):
+    """Tags every capitalized word as a PER entity and records what it is asked to process."""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.texts = []
+        self.batches = []
+
+    def load(self):
+        return True
+
+    def unload(self):
+        return True
+
+    def is_loaded(self):
+        return True
+
+    def extract_entities(self, text):
+        self.texts.append(text)
+        if self.fail_on is not None and self.fail_on in text:
+            raise RuntimeError(f"cannot process {text!r}")
+        return [Entity(match.group(), ["PER"], match.start(), match.end(), 0.9) for match in re.finditer(r"[A-Z][a-z]+", text)]
+
+    def extract_entities_batch(self, texts):
+        self.batches.append(list(texts))
+        return super().extract_entities_batch(texts)
+
+
+def entity_texts(results):
+    return [[entity.text for entity in entities] for entities in results]
+
+
+def test_batch_keeps_input_order():
+    model = StubNERModel()
+    processor = NERProcessor(model)
+    texts = ["Alice met Bob", "", "nobody here", "Carol", "Dan and Eve"]
+
+    results = processor.extract_entities_batch(texts)
+
+    assert entity_texts(results) == [["Alice", "Bob"], [], [], ["Carol"], ["Dan", "Eve"]]
+    # Empty texts are not passed to the model, the others in a single call
+    assert model.batches == [["Alice met Bob", "nobody here", "Carol", "Dan and Eve"]]
+
+
+def test_duplicate_texts_reach_the_model_once():
+    model = StubNERModel()
+    processor = NERProcessor(model)
+
+    results = processor.extract_entities_batch(["Alice", "Bob", "Alice", "Alice"])
+
+    assert entity_texts(results) == [["Alice"], ["Bob"], ["Alice"], ["Alice"]]
+    assert model.texts == ["Alice", "Bob"]
+
+    # Duplicates get their own lists, so callers can modify one without affecting the others
+    results[0].clear()
+    assert entity_texts(results[2:]) == [["Alice"], ["Alice"]]
+
+
+def test_cache_hits_skip_the_model():
+    model = StubNERModel()
+    processor = NERProcessor(model)
+    processor.extract_entities_batch(["Alice", "Bob"])
+
+    results = processor.extract_entities_batch(["Bob", "Carol", "Alice"])
+
+    assert entity_texts(results) == [["Bob"], ["Carol"], ["Alice"]]
+    assert model.batches == [["Alice", "Bob"], ["Carol"]]
+
+    processor.extract_entities_batch(["Alice", "Carol"])
+    assert len(model.batches) == 2
+
+
+def test_cached_entities_are_copied():
+    processor = NERProcessor(StubNERModel())
+    first, duplicate = processor.extract_entities_batch(["Alice", "Alice"])
+
+    first[0].start_pos += 10
+    first[0].labels.append("LOC")
+
+    (hit,) = processor.extract_entities_batch(["Alice"])
+    for entities in (duplicate, hit):
+        assert entities == [Entity("Alice", ["PER"], 0, 5, 0.9)]
+
+
+def test_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(ner, "ENTITY_CACHE_SIZE", 2)
+    model = StubNERModel()
+    processor = NERProcessor(model)
+
+    processor.extract_entities_batch(["Alice", "Bob"])
+    processor.extract_entities_batch(["Alice"])
+    processor.extract_entities_batch(["Carol"])
+    model.texts.clear()
+
+    processor.extract_entities_batch(["Alice", "Bob", "Carol"])
+
+    assert model.texts == ["Bob"]
+
+
+def test_long_texts_get_shifted_offsets():
+    processor = NERProcessor(StubNERModel())
+    lines = ["Alice"] + [" ".join(["word"] * 99 + [f"Name{chr(97 + i % 26)}"]) for i in range(150)] + ["Zed"]
+    long_text = "\n".join(lines)
+    assert len(ner.split_long_document(long_text)) > 2
+
+    entities = processor.extract_entities(long_text)
+
+    assert len(entities) == 152
+    for entity in entities:
+        assert long_text[entity.start_pos : entity.end_pos] == entity.text
+
+
+def test_failing_document_loses_only_its_own_entities():
+    model = StubNERModel(fail_on="Mallory")
+    processor = NERProcessor(model)
+    documents = {"1": "Alice", "2": "Mallory", "3": "", "4": "Bob and Carol"}
+
+    results = processor.process_documents(documents)
+
+    assert list(results) == ["1", "4"]
+    assert [entity["text"] for entity in results["4"]] == ["Bob", "Carol"]
+    assert results["4"][1] == {"text": "Carol", "labels": ["PER"], "start_pos": 8, "end_pos": 13, "confidence": 0.9}
+
+
+def test_documents_are_processed_in_batches(monkeypatch):
+    monkeypatch.setattr(ner, "DOCUMENT_BATCH_SIZE", 2)
+    model = StubNERModel()
+    processor = NERProcessor(model)
+    documents = {str(i): f"Name{i} text" if i % 3 else "   " for i in range(7)}
+
+    extracted = list(processor._iter_documents(documents, "test"))
+
+    assert [doc_id for doc_id, _ in extracted] == ["1", "2", "4", "5"]
+    assert [len(batch) for batch in model.batches] == [2, 2]
+
+
+def test_short_format():
+    processor = NERProcessor(StubNERModel())
+
+    results = processor.process_documents_short_format({"a": "Alice", "b": "none"})
+
+    assert results == {"a": [{"t": "Alice", "l": ["PER"], "s": 0, "e": 5, "c": 0.9}], "b": []}
@@ -0,0 +1,108 @@
+import threading
+
+import pytest
+
+from histtext_toolkit.models.base import RequestBatcher
+
+
+def test_submit_returns_each_items_result():
+    batcher = RequestBatcher(lambda items: [item * 2 for item in items])
+    try:
+        futures = [batcher.submit(i) for i in range(100)]
+        assert [future.result(timeout=5) for future in futures] == [i * 2 for i in range(100)]
+    finally:
+        batcher.close()
+
+
+def test_queued_items_are_batched():
+    started = threading.Event()
+    release = threading.Event()
+    batches = []
+
+    def process(items):
+        batches.append(list(items))
+        started.set()
+        release.wait(timeout=5)
+        return items
+
+    batcher = RequestBatcher(process, max_batch=4)
+    try:
+        first = batcher.submit(0)
+        # Items queued while the first call runs are passed together, at most max_batch at a time
+        assert started.wait(timeout=5)
+        futures = [batcher.submit(i) for i in range(1, 7)]
+        release.set()
+
+        assert first.result(timeout=5) == 0
+        assert [future.result(timeout=5) for future in futures] == list(range(1, 7))
+    finally:
+        batcher.close()
+
+    assert batches == [[0], [1, 2, 3, 4], [5, 6]]
+
+
+def test_errors_propagate_to_the_batch():
+    def process(items):
+        if "bad" in items:
+            raise ValueError("bad item")
+        return items
+
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_process(items):
+        started.set()
+        release.wait(timeout=5)
+        return process(items)
+
+    batcher = RequestBatcher(blocking_process)
+    try:
+        first = batcher.submit("ok")
+        assert started.wait(timeout=5)
+        failing = [batcher.submit("bad"), batcher.submit("also in the batch")]
+        release.set()
+
+        assert first.result(timeout=5) == "ok"
+        for future in failing:
+            with pytest.raises(ValueError, match="bad item"):
+                future.result(timeout=5)
+
+        # The batching thread keeps serving later items
+        assert batcher.submit("after").result(timeout=5) == "after"
+    finally:
+        batcher.close()
+
+
+def test_close_processes_queued_items():
+    started = threading.Event()
+    release = threading.Event()
+
+    def process(items):
+        started.set()
+        release.wait(timeout=5)
+        return [item + 1 for item in items]
+
+    batcher = RequestBatcher(process, name="test-batcher")
+    first = batcher.submit(1)
+    assert started.wait(timeout=5)
+    second = batcher.submit(2)
+
+    closer = threading.Thread(target=batcher.close)
+    closer.start()
+    release.set()
+    closer.join(timeout=5)
+
+    assert not closer.is_alive()
+    assert first.result(timeout=0) == 2
+    assert second.result(timeout=0) == 3
+    assert not batcher._thread.is_alive()
+
+
+def test_missing_results_fail_the_batch():
+    batcher = RequestBatcher(lambda items: items[:-1])
+    try:
+        with pytest.raises(ValueError, match="returned 0 results for 1 items"):
+            batcher.submit("lost").result(timeout=5)
+        assert batcher._thread.is_alive()
+    finally:
+        batcher.close()
@@ -0,0 +1,172 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("transformers")
+
+import torch  # noqa: E402
+from transformers import BertConfig, BertForTokenClassification, BertTokenizerFast  # noqa: E402
+
+from histtext_toolkit.models import transformers_model  # noqa: E402
+from histtext_toolkit.models.transformers_model import TransformersNERModel  # noqa: E402
+
+
+class FakeTokenClassifier:
+    """Stands in for a loaded token classification model."""
+
+    def to(self, device):
+        return self
+
+    def eval(self):
+        return self
+
+    def parameters(self):
+        return []
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    monkeypatch.setattr(TransformersNERModel, "_MODEL_CACHE", {})
+    monkeypatch.setattr(TransformersNERModel, "_MODEL_REFCOUNT", {})
+
+
+@pytest.fixture
+def fake_loading(monkeypatch, shared_cache):
+    loads = []
+
+    def from_pretrained(model_path, **kwargs):
+        loads.append(model_path)
+        # Widen the window in which concurrent loads of the same key could race
+        time.sleep(0.05)
+        return FakeTokenClassifier()
+
+    monkeypatch.setattr(transformers_model.AutoTokenizer, "from_pretrained", lambda model_path, **kwargs: object())
+    monkeypatch.setattr(transformers_model.AutoModelForTokenClassification, "from_pretrained", from_pretrained)
+    return loads
+
+
+def run_in_threads(target, items):
+    barrier = threading.Barrier(len(items))
+
+    def run(item):
+        barrier.wait()
+        target(item)
+
+    threads = [threading.Thread(target=run, args=(item,)) for item in items]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+
+def test_concurrent_loads_share_one_model(fake_loading):
+    models = [TransformersNERModel("fake/ner") for _ in range(8)]
+
+    run_in_threads(lambda model: model.load(), models)
+
+    assert fake_loading == ["fake/ner"]
+    assert all(model.is_loaded for model in models)
+    assert len({id(model._model) for model in models}) == 1
+    assert TransformersNERModel._MODEL_REFCOUNT[models[0]._cache_key()] == len(models)
+
+    run_in_threads(lambda model: model.unload(), models)
+
+    assert TransformersNERModel._MODEL_CACHE == {}
+    assert TransformersNERModel._MODEL_REFCOUNT == {}
+
+
+@pytest.fixture
+def tiny_model_path(tmp_path):
+    words = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "alice", "met", "bob", "in", "paris", "and", "carol"]
+    vocab_path = tmp_path / "vocab.txt"
+    vocab_path.write_text("\n".join(words), encoding="utf-8")
+    config = BertConfig(
+        vocab_size=len(words),
+        hidden_size=8,
+        num_hidden_layers=1,
+        num_attention_heads=1,
+        intermediate_size=16,
+        id2label={0: "O", 1: "B-PER", 2: "I-PER"},
+        label2id={"O": 0, "B-PER": 1, "I-PER": 2},
+    )
+    torch.manual_seed(0)
+    model_path = tmp_path / "tiny-ner"
+    BertForTokenClassification(config).save_pretrained(model_path)
+    BertTokenizerFast(vocab_file=str(vocab_path), do_lower_case=True).save_pretrained(model_path)
+    return str(model_path)
+
+
+class FakeORTModelForTokenClassification:
+    """Mimics optimum's ORTModelForTokenClassification: callable like the model, but not a torch Module."""
+
+    main_input_name = "input_ids"
+    loads = []
+
+    def __init__(self, model):
+        self._model = model
+        self.config = model.config
+        self.device = torch.device("cpu")
+
+    @classmethod
+    def from_pretrained(cls, model_path, **kwargs):
+        cls.loads.append((model_path, kwargs))
+        return cls(BertForTokenClassification.from_pretrained(model_path).eval())
+
+    def __call__(self, **inputs):
+        return self._model(**inputs)
+
+    def forward(self, **inputs):
+        return self(**inputs)
+
+    def to(self, device):
+        return self
+
+    def can_generate(self):
+        return False
+
+
+@pytest.fixture
+def fake_onnx(monkeypatch, shared_cache):
+    FakeORTModelForTokenClassification.loads = []
+    monkeypatch.setattr(transformers_model, "ONNX_AVAILABLE", True)
+    monkeypatch.setattr(transformers_model, "onnxruntime", SimpleNamespace(SessionOptions=SimpleNamespace), raising=False)
+    monkeypatch.setattr(transformers_model, "ORTModelForTokenClassification", FakeORTModelForTokenClassification, raising=False)
+    return FakeORTModelForTokenClassification.loads
+
+
+def load_on_cpu(model):
+    model._device = "cpu"
+    assert model.load()
+    return model
+
+
+def test_onnx_model_runs_through_the_pipeline(tiny_model_path, fake_onnx):
+    texts = ["Alice met Bob in Paris", "", "Carol and Alice", "bob met carol in paris and alice met bob"]
+    onnx = load_on_cpu(TransformersNERModel(tiny_model_path, use_onnx=True))
+    eager = load_on_cpu(TransformersNERModel(tiny_model_path))
+
+    assert isinstance(onnx._model, FakeORTModelForTokenClassification)
+    assert [(path, kwargs["export"], kwargs["provider"]) for path, kwargs in fake_onnx] == [(tiny_model_path, True, "CPUExecutionProvider")]
+
+    onnx_entities = onnx.extract_entities_batch(texts)
+    eager_entities = eager.extract_entities_batch(texts)
+
+    assert any(onnx_entities)
+    assert [[(e.text, e.labels, e.start_pos, e.end_pos) for e in entities] for entities in onnx_entities] == [
+        [(e.text, e.labels, e.start_pos, e.end_pos) for e in entities] for entities in eager_entities
+    ]
+    for onnx_doc, eager_doc in zip(onnx_entities, eager_entities, strict=True):
+        assert [e.confidence for e in onnx_doc] == pytest.approx([e.confidence for e in eager_doc], abs=1e-5)
+
+
+def test_failed_onnx_export_falls_back_to_pytorch(tiny_model_path, fake_onnx, monkeypatch):
+    def failing_from_pretrained(model_path, **kwargs):
+        raise RuntimeError("export failed")
+
+    monkeypatch.setattr(FakeORTModelForTokenClassification, "from_pretrained", failing_from_pretrained)
+    model = load_on_cpu(TransformersNERModel(tiny_model_path, use_onnx=True))
+
+    assert isinstance(model._model, BertForTokenClassification)
+    assert isinstance(model.extract_entities("Alice met Bob"), list)
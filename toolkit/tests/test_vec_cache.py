@@ -0,0 +1,163 @@
+import os
+
+import numpy as np
+import pytest
+
+from histtext_toolkit.core.errors import ModelError
+from histtext_toolkit.models import fasttext_model
+from histtext_toolkit.models.fasttext_model import FastTextEmbeddingsModel
+
+pytest.importorskip("fasttext")
+
+VECTORS = {
+    "the": [0.1, 0.2, 0.3, 0.4],
+    "cat": [1.0, -1.0, 0.5, 0.0],
+    "sat": [0.0, 0.25, -0.5, 2.0],
+}
+
+
+@pytest.fixture
+def vec_path(tmp_path):
+    path = tmp_path / "vectors" / "words.vec"
+    path.parent.mkdir()
+    lines = [f"{len(VECTORS) + 1} 4"] + [f"{word} {' '.join(map(str, vector))}" for word, vector in VECTORS.items()]
+    lines.insert(2, "broken 1.0 2.0")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def load(vec_path, **kwargs):
+    model = FastTextEmbeddingsModel(vec_path, **kwargs)
+    assert model._load_vec_file(vec_path)
+    return model
+
+
+def cache_files(directory):
+    return sorted(name for name in os.listdir(directory) if not name.endswith(".vec"))
+
+
+@pytest.mark.parametrize("vec_dtype", ["f32", "f16", "i8"])
+def test_vectors_are_parsed(vec_path, vec_dtype):
+    model = load(vec_path, vec_dtype=vec_dtype, vec_cache=False)
+
+    assert model.dim == 4
+    assert list(model._model.word_to_idx) == list(VECTORS)
+    for word, vector in VECTORS.items():
+        np.testing.assert_allclose(model._model.get_word_vector(word), vector, atol=0.02)
+    assert not model._model.get_word_vector("dog").any()
+
+
+def test_cache_is_disabled_by_default(vec_path):
+    model = load(vec_path)
+
+    assert not isinstance(model._model.matrix, np.memmap)
+    assert cache_files(os.path.dirname(vec_path)) == []
+
+
+def test_failed_cache_write_loads_without_cache(vec_path, monkeypatch):
+    def failing_save(file, array):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(fasttext_model.np, "save", failing_save)
+    model = load(vec_path, vec_cache=True)
+
+    # The parsed vectors are used directly and no partial files are left behind
+    assert list(model._model.word_to_idx) == list(VECTORS)
+    np.testing.assert_allclose(model._model.get_word_vector("cat"), VECTORS["cat"], atol=0.01)
+    assert cache_files(os.path.dirname(vec_path)) == []
+
+
+def test_cache_is_written_and_memory_mapped(vec_path):
+    first = load(vec_path, vec_cache=True)
+
+    # The lock file is removed once the cache is written
+    assert cache_files(os.path.dirname(vec_path)) == ["words.vec.f16.npy", "words.vec.words"]
+
+    second = load(vec_path, vec_cache=True)
+
+    assert isinstance(second._model.matrix, np.memmap)
+    assert not second._model.matrix.flags.writeable
+    np.testing.assert_array_equal(second._model.matrix, first._model.matrix)
+    assert list(second._model.word_to_idx) == list(VECTORS)
+
+
+def test_int8_cache_includes_scales(vec_path):
+    first = load(vec_path, vec_dtype="i8", vec_cache=True)
+    second = load(vec_path, vec_dtype="i8", vec_cache=True)
+
+    assert cache_files(os.path.dirname(vec_path)) == ["words.vec.i8.npy", "words.vec.i8.scales.npy", "words.vec.words"]
+    assert isinstance(second._model.matrix, np.memmap)
+    np.testing.assert_array_equal(second._model.scales, first._model.scales)
+
+
+def test_cache_dir(vec_path, tmp_path):
+    cache_dir = tmp_path / "cache"
+    model = load(vec_path, vec_cache=True, vec_cache_dir=str(cache_dir))
+    matrix_path, words_path, _ = model._vec_cache_paths(vec_path)
+
+    assert cache_files(os.path.dirname(vec_path)) == []
+    assert sorted(os.listdir(cache_dir)) == sorted([os.path.basename(matrix_path), os.path.basename(words_path)])
+    assert os.path.basename(matrix_path).startswith("histtext_")
+    assert os.path.basename(matrix_path).endswith("_words.vec.f16.npy")
+
+    assert isinstance(load(vec_path, vec_cache=True, vec_cache_dir=str(cache_dir))._model.matrix, np.memmap)
+
+
+def test_fallback_cache_dir_for_read_only_vec_dir(vec_path, tmp_path, monkeypatch):
+    fallback = tmp_path / "fallback"
+    monkeypatch.setattr(fasttext_model, "VEC_FALLBACK_CACHE_DIR", str(fallback))
+    monkeypatch.setattr(fasttext_model.os, "access", lambda path, mode: mode != os.W_OK)
+
+    load(vec_path, vec_cache=True)
+
+    assert cache_files(os.path.dirname(vec_path)) == []
+    assert len(os.listdir(fallback)) == 2
+
+
+def test_stale_cache_is_rebuilt(vec_path):
+    load(vec_path, vec_cache=True)
+    model = FastTextEmbeddingsModel(vec_path, vec_cache=True)
+    matrix_path, _, _ = model._vec_cache_paths(vec_path)
+
+    # A cache older than the .vec file is ignored and replaced
+    mtime = os.path.getmtime(vec_path)
+    os.utime(matrix_path, (mtime - 10, mtime - 10))
+    assert model._load_vec_cache(vec_path) is None
+
+    load(vec_path, vec_cache=True)
+    assert os.path.getmtime(matrix_path) >= mtime
+    assert model._load_vec_cache(vec_path) is not None
+
+
+def test_inconsistent_cache_is_ignored(vec_path):
+    model = load(vec_path, vec_cache=True)
+    _, words_path, _ = model._vec_cache_paths(vec_path)
+
+    with open(words_path, "a", encoding="utf-8") as f:
+        f.write("\nextra")
+
+    assert model._load_vec_cache(vec_path) is None
+
+
+def test_invalid_header(tmp_path):
+    path = tmp_path / "bad.vec"
+    path.write_text("not a header\n", encoding="utf-8")
+
+    with pytest.raises(ModelError):
+        FastTextEmbeddingsModel(str(path), vec_cache=False)._load_vec_file(str(path))
+
+
+def test_cached_embeddings_are_read_only_copies(vec_path):
+    model = FastTextEmbeddingsModel(vec_path)
+    assert model.load()
+
+    first = model.embed_batch(["the cat", "cat sat"])
+    again = model.embed_batch(["the cat"])
+
+    assert again[0] is first[0]
+    assert not first[0].flags.writeable
+    # Each cached vector owns its data instead of viewing the gathered batch
+    assert first[0].base is None and first[1].base is None
+    with pytest.raises(ValueError):
+        first[0] += 1
+    np.testing.assert_allclose(again[0], np.mean([VECTORS["the"], VECTORS["cat"]], axis=0), atol=0.01)
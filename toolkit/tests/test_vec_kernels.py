@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from histtext_toolkit.models import _vec_kernels
+from histtext_toolkit.models._vec_kernels import mean_embedding, mean_embeddings
+from histtext_toolkit.models.base import quantize_embeddings
+
+
+@pytest.fixture(params=["numba", "numpy"])
+def kernel_path(request, monkeypatch):
+    """Run each test with the compiled kernels and with the NumPy fallback."""
+    if request.param == "numba":
+        if not _vec_kernels.NUMBA_AVAILABLE:
+            pytest.skip("numba is not installed")
+    else:
+        monkeypatch.setattr(_vec_kernels, "NUMBA_AVAILABLE", False)
+    return request.param
+
+
+@pytest.fixture
+def matrix():
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((50, 8)).astype(np.float32)
+
+
+def test_mean_embedding(kernel_path, matrix):
+    idxs = np.array([3, 7, 3, 12], dtype=np.int64)
+
+    mean = mean_embedding(matrix, idxs)
+
+    assert mean.dtype == np.float32
+    np.testing.assert_allclose(mean, matrix[idxs].mean(axis=0), rtol=1e-5, atol=1e-6)
+
+
+def test_mean_embedding_skips_unknown_words(kernel_path, matrix):
+    idxs = np.array([-1, 4, -1, 9], dtype=np.int64)
+
+    np.testing.assert_allclose(mean_embedding(matrix, idxs), matrix[[4, 9]].mean(axis=0), rtol=1e-5, atol=1e-6)
+
+
+def test_mean_embedding_without_known_words(kernel_path, matrix):
+    assert mean_embedding(matrix, np.array([-1, -1], dtype=np.int64)) is None
+    assert mean_embedding(matrix, np.array([], dtype=np.int64)) is None
+
+
+def test_mean_embedding_skips_nan_rows(kernel_path, matrix):
+    matrix[5, 2] = np.nan
+    idxs = np.array([1, 5, 2], dtype=np.int64)
+
+    mean = mean_embedding(matrix, idxs)
+
+    np.testing.assert_allclose(mean, matrix[[1, 2]].mean(axis=0), rtol=1e-5, atol=1e-6)
+
+    matrix[[1, 2], 0] = np.nan
+    assert mean_embedding(matrix, idxs) is None
+
+
+def test_mean_embedding_parallel(kernel_path, monkeypatch, matrix):
+    monkeypatch.setattr(_vec_kernels, "PARALLEL_THRESHOLD", 16)
+    idxs = np.random.default_rng(1).integers(-1, matrix.shape[0], size=1000)
+
+    expected = matrix[idxs[idxs >= 0]].mean(axis=0)
+    np.testing.assert_allclose(mean_embedding(matrix, idxs), expected, rtol=1e-4, atol=1e-5)
+
+
+def test_mean_embedding_quantized(kernel_path, matrix):
+    quantized, scales = quantize_embeddings(matrix, "int8")
+    idxs = np.array([0, 10, 20], dtype=np.int64)
+
+    mean = mean_embedding(quantized, idxs, scales)
+
+    expected = (quantized[idxs].astype(np.float32) * scales[idxs, None]).mean(axis=0)
+    np.testing.assert_allclose(mean, expected, rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(mean, matrix[idxs].mean(axis=0), atol=0.05)
+
+
+def test_mean_embeddings(kernel_path, matrix):
+    matrix[6, 0] = np.nan
+    texts = [[1, 2, 3], [], [-1, -1], [4, -1, 6, 4], [6]]
+    lengths = np.array([len(text) for text in texts], dtype=np.int64)
+    idxs = np.array([i for text in texts for i in text], dtype=np.int64)
+
+    means, counts = mean_embeddings(matrix, idxs, lengths)
+
+    assert means.shape == (len(texts), matrix.shape[1])
+    assert means.dtype == np.float32
+    assert counts.tolist() == [3, 0, 0, 2, 0]
+    for mean, text in zip(means, texts, strict=True):
+        valid = [i for i in text if i >= 0 and i != 6]
+        expected = matrix[valid].mean(axis=0) if valid else np.zeros(matrix.shape[1])
+        np.testing.assert_allclose(mean, expected, rtol=1e-5, atol=1e-6)
+
+
+def test_mean_embeddings_matches_mean_embedding(kernel_path, matrix):
+    quantized, scales = quantize_embeddings(matrix, "int8")
+    texts = [[0, 1], [2, -1, 3], [49]]
+    lengths = np.array([len(text) for text in texts], dtype=np.int64)
+    idxs = np.array([i for text in texts for i in text], dtype=np.int64)
+
+    means, _ = mean_embeddings(quantized, idxs, lengths, scales)
+
+    for mean, text in zip(means, texts, strict=True):
+        np.testing.assert_allclose(mean, mean_embedding(quantized, np.array(text, dtype=np.int64), scales), rtol=1e-5, atol=1e-6)